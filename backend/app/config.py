@@ -9,20 +9,118 @@ class Settings(BaseSettings):
     postgres_password: str
     postgres_db: str
     
+    # Async database pool (asyncpg)
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout: float = 30.0
+    database_statement_cache_size: int = 100
+    
     # JWT
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     
+    # Password hashing (bcrypt runs in a dedicated thread pool)
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = os.cpu_count() or 4
+    
+    # Authenticated-user cache used by the shared auth dependency
+    auth_user_cache_ttl: int = 30
+    auth_user_cache_max_entries: int = 10000
+    
+    # Write-behind buffer for low-priority bookkeeping updates (e.g. last_login)
+    write_behind_flush_interval: float = 5.0
+    write_behind_max_pending: int = 10000
+    
     # CORS
     allowed_origins: str = "http://localhost:3000,http://localhost:5173,http://100.113.79.96:3000"
     
     # Environment
     environment: str = "development"
     
+    # Prometheus metrics exposed at /metrics
+    metrics_enabled: bool = True
+    metrics_token: str = ""
+    
+    # Opt-in diagnostics: event loop block detector and the admin sampling profiler
+    loop_block_detector_enabled: bool = False
+    loop_block_threshold: float = 0.5
+    profiler_enabled: bool = False
+    profiler_max_seconds: float = 30.0
+    memory_profiler_enabled: bool = False
+    memory_profiler_frames: int = 1
+    
+    # Users allowed to access the /admin endpoints (comma-separated emails)
+    admin_emails: str = ""
+    
     # Guild Wars 2 API
     gw2_api_base_url: str = "https://api.guildwars2.com/v2"
     gw2_api_timeout: int = 30
+    gw2_http2: bool = True
+    gw2_max_connections: int = 100
+    gw2_max_keepalive_connections: int = 20
+    gw2_keepalive_expiry: float = 30.0
+    gw2_batch_chunk_size: int = 200
+    gw2_batch_concurrency: int = 8
+    gw2_batch_window_ms: float = 5.0
+    
+    # Opt-in /gw2/raw passthrough, restricted to these endpoints (comma-separated, sub-paths included)
+    gw2_passthrough_enabled: bool = False
+    gw2_passthrough_endpoints: str = (
+        "items,skins,recipes,achievements,currencies,worlds,maps,continents,skills,traits,"
+        "specializations,professions,minis,outfits,titles,colors,materials,mounts,pets,commerce/prices"
+    )
+    
+    # Guild Wars 2 upstream rate limit (per IP, split evenly across the uvicorn workers)
+    gw2_rate_limit_enabled: bool = True
+    gw2_rate_limit_per_minute: int = 300
+    gw2_rate_limit_burst: int = 300
+    gw2_rate_limit_workers: int = int(os.getenv("WEB_CONCURRENCY") or 1)
+    gw2_rate_limit_max_retries: int = 2
+    
+    # Guild Wars 2 response cache (TTL in seconds)
+    gw2_cache_enabled: bool = True
+    gw2_cache_max_bytes: int = 128 * 1024 * 1024
+    gw2_cache_max_entries: int = 50000
+    gw2_cache_ttl_static: int = 6 * 60 * 60
+    gw2_cache_ttl_dynamic: int = 60
+    gw2_cache_ttl_commerce: int = 30
+    gw2_cache_ttl_account: int = 60
+    gw2_cache_stale_ttl: int = 24 * 60 * 60
+    gw2_cache_ttl_not_found: int = 5 * 60
+    
+    # On-disk second-level cache (SQLite in WAL mode) shared by all uvicorn workers
+    gw2_disk_cache_enabled: bool = True
+    gw2_disk_cache_path: str = "data/gw2_cache.sqlite3"
+    gw2_disk_cache_max_bytes: int = 512 * 1024 * 1024
+    
+    # Startup cache warm-up (comma-separated lists) and in-memory cache snapshot
+    gw2_warmup_enabled: bool = True
+    gw2_warmup_endpoints: str = "build,worlds,currencies,professions,achievements/daily"
+    gw2_warmup_item_ids: str = "19721,19976,19675,20796,46731,46733,46735,24295,24358,24351,24357,24289,24300,24283"
+    gw2_warmup_timeout: float = 30.0
+    gw2_cache_snapshot_enabled: bool = True
+    gw2_cache_snapshot_path: str = "data/gw2_cache_snapshot.json.gz"
+    
+    # Guild Wars 2 upstream resilience (stale responses are served after gw2_stale_timeout seconds)
+    gw2_circuit_breaker_enabled: bool = True
+    gw2_circuit_failure_threshold: int = 5
+    gw2_circuit_reset_timeout: int = 30
+    gw2_stale_timeout: float = 2.0
+    
+    # Guild Wars 2 build watcher (static catalogs are cached until the next build)
+    gw2_build_watch_enabled: bool = True
+    gw2_build_poll_interval: int = 60
+    gw2_cache_ttl_build_scoped: int = 7 * 24 * 60 * 60
+    
+    # Local Postgres mirror of the large GW2 catalogs (items, skins, recipes, achievements)
+    gw2_catalog_mirror_enabled: bool = False
+    gw2_catalog_sync_interval: int = 6 * 60 * 60
+    gw2_catalog_sync_concurrency: int = 4
+    
+    # Compact in-memory catalogs (columnar, comma-separated list) used to answer lookups by id
+    gw2_compact_catalog_enabled: bool = False
+    gw2_compact_catalogs: str = "items,skins"
     
     class Config:
         env_file = ".env"
@@ -32,6 +130,31 @@ class Settings(BaseSettings):
     def allowed_origins_list(self) -> List[str]:
         """Converte a string de allowed_origins em uma lista"""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
+    
+    @property
+    def admin_emails_list(self) -> List[str]:
+        """Converte a string de admin_emails em uma lista de emails em minúsculas"""
+        return [email.strip().lower() for email in self.admin_emails.split(",") if email.strip()]
+    
+    @property
+    def gw2_passthrough_endpoints_list(self) -> List[str]:
+        """Converte a string de gw2_passthrough_endpoints em uma lista"""
+        return [endpoint.strip().strip("/") for endpoint in self.gw2_passthrough_endpoints.split(",") if endpoint.strip()]
+    
+    @property
+    def gw2_compact_catalogs_list(self) -> List[str]:
+        """Converte a string de gw2_compact_catalogs em uma lista"""
+        return [catalog.strip() for catalog in self.gw2_compact_catalogs.split(",") if catalog.strip()]
+    
+    @property
+    def gw2_warmup_endpoints_list(self) -> List[str]:
+        """Converte a string de gw2_warmup_endpoints em uma lista"""
+        return [endpoint.strip() for endpoint in self.gw2_warmup_endpoints.split(",") if endpoint.strip()]
+    
+    @property
+    def gw2_warmup_item_ids_list(self) -> List[int]:
+        """Converte a string de gw2_warmup_item_ids em uma lista de ids"""
+        return [int(item_id) for item_id in self.gw2_warmup_item_ids.split(",") if item_id.strip()]
 
 # Load settings from environment
 settings = Settings()
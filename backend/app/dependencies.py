@@ -0,0 +1,61 @@
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from database.connection import get_async_db
+from app.schemas import User
+from app.utils.auth import verify_token
+from services.user_cache import user_cache
+from services.user_service import UserService
+
+security = HTTPBearer()
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Resolve the authenticated user from the bearer token.
+
+    Users are served from a short-lived cache, so hot authenticated endpoints skip the
+    database; the session is only used (and a connection checked out) on a cache miss.
+    """
+    token = credentials.credentials
+    email = verify_token(token)
+    if email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    
+    user_service = UserService(db)
+    db_user = await user_service.get_user_by_email(email)
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    if not db_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account is deactivated"
+        )
+    
+    user = User.model_validate(db_user)
+    user_cache.set(email, user)
+    return user
+
+async def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    """Require the authenticated user to be listed in settings.admin_emails."""
+    if current_user.email.lower() not in settings.admin_emails_list:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
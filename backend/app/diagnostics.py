@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+import types
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is still running."""
+
+
+class LoopBlockDetector:
+    """Logs the stack of whatever is blocking the event loop for longer than `threshold`.
+
+    A heartbeat task on the loop records when it last ran; a watchdog thread checks the
+    heartbeat and, once it is `threshold` seconds late, captures the loop thread's current
+    frame. That frame belongs to the callback that is holding the loop (sync database
+    calls, bcrypt, large JSON encoding), so each stall is reported once with its stack.
+    """
+
+    def __init__(self, threshold: float = 0.5, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls = 0
+        self.last_stall: Optional[Dict[str, Any]] = None
+        self._heartbeat_at = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def _heartbeat(self):
+        while True:
+            self._heartbeat_at = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        reported = None
+        while not self._stopped.wait(self.interval):
+            heartbeat_at = self._heartbeat_at
+            blocked = time.monotonic() - heartbeat_at - self.interval
+            if blocked < self.threshold or heartbeat_at == reported:
+                continue
+            reported = heartbeat_at
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>"
+            self.stalls += 1
+            self.last_stall = {"blocked_for": round(blocked, 3), "detected_at": time.time(), "stack": stack}
+            logger.warning(f"Event loop blocked for more than {blocked:.3f}s; stack of the running callback:\n{stack}")
+
+    async def start(self):
+        if self._thread is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat_at = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-block-detector", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._thread is None:
+            return
+        self._stopped.set()
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._thread is not None,
+            "threshold": self.threshold,
+            "stalls": self.stalls,
+            "last_stall": self.last_stall,
+        }
+
+
+class SamplingProfiler:
+    """Time-boxed sampling profiler producing collapsed stacks.
+
+    A background thread samples the stacks of the selected threads every `interval`
+    seconds using `sys._current_frames()`; no tracing hooks are installed, so the cost
+    is limited to the sampling thread. The output is one line per distinct stack,
+    `frame;frame;frame count` from the root, which flamegraph.pl and speedscope read
+    directly. Only one profile runs at a time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    @staticmethod
+    def _collapse(frame) -> str:
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})".replace(";", ":"))
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def _sample(self, thread_ids: Optional[Set[int]], duration: float, interval: float) -> Counter:
+        stacks: Counter = Counter()
+        sampler = threading.get_ident()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler or (thread_ids is not None and thread_id not in thread_ids):
+                    continue
+                stacks[self._collapse(frame)] += 1
+            time.sleep(interval)
+        return stacks
+
+    async def profile(self, duration: float, interval: float = 0.01, all_threads: bool = False) -> str:
+        """Sample for `duration` seconds and return the collapsed stacks.
+
+        By default only the event loop thread (the caller's) is sampled; `all_threads`
+        also includes worker threads such as the password hashing pool.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            thread_ids = None if all_threads else {threading.get_ident()}
+            stacks = await asyncio.to_thread(self._sample, thread_ids, duration, interval)
+        finally:
+            self._lock.release()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+# Objects that are shared by the whole process and never attributed to a cache entry
+_UNSIZED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Approximate memory held by `obj` and the containers and objects it references.
+
+    Objects already in `seen` are skipped, so passing the same set across calls counts
+    shared objects (e.g. interned keys or header dicts) only once.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _UNSIZED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                pending.append(item.__dict__)
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    pending.append(getattr(item, slot))
+    return size
+
+
+def _measure_cache(entries: Iterable[Tuple[str, Any]], catalog: Callable[[str], str]) -> Dict[str, Any]:
+    seen: Set[int] = set()
+    groups: Dict[str, Dict[str, Dict[str, int]]] = {"namespaces": {}, "catalogs": {}}
+    for item in entries:
+        # `item` itself is sized (not a new tuple) so its id cannot be reused while `seen` is alive
+        key, entry = item
+        total = deep_sizeof(item, seen)
+        for group, name in (("namespaces", entry.namespace), ("catalogs", catalog(key))):
+            usage = groups[group].setdefault(name, {"entries": 0, "body_bytes": 0, "approx_bytes": 0})
+            usage["entries"] += 1
+            usage["body_bytes"] += entry.value.size
+            usage["approx_bytes"] += total
+    return {
+        group: dict(sorted(usages.items(), key=lambda item: item[1]["approx_bytes"], reverse=True))
+        for group, usages in groups.items()
+    }
+
+
+async def cache_footprint(entries: List[Tuple[str, Any]], catalog: Callable[[str], str]) -> Dict[str, Any]:
+    """Approximate memory per cache namespace and per catalog (endpoint).
+
+    `body_bytes` is what the cache bounds count; `approx_bytes` also includes keys, entry
+    objects and headers, i.e. the per-entry overhead on top of the bodies. The
+    walk runs in a worker thread over a copy of the entries taken on the event loop.
+    """
+    return await asyncio.to_thread(_measure_cache, entries, catalog)
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Resident set size of the worker process, current (Linux only) and peak."""
+    rss = None
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return {"rss_bytes": rss, "peak_rss_bytes": peak if sys.platform == "darwin" else peak * 1024}
+
+
+class AllocationTracker:
+    """tracemalloc snapshots diffed between consecutive calls to `diff()`.
+
+    The first call starts tracing (allocations made before that are not attributed) and
+    records a baseline; each following call returns the top allocation sites by growth
+    since the previous call and becomes the new baseline. Tracing slows allocations
+    down noticeably, so it is only started on demand and stopped with `stop()`.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._previous_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    @staticmethod
+    def _take() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    @staticmethod
+    def _top(snapshot: tracemalloc.Snapshot, previous: Optional[tracemalloc.Snapshot], key_type: str, limit: int):
+        if previous is None:
+            stats = snapshot.statistics(key_type)
+        else:
+            stats = snapshot.compare_to(previous, key_type)
+        return [
+            {
+                "location": stat.traceback.format(),
+                "size": stat.size,
+                "size_diff": getattr(stat, "size_diff", stat.size),
+                "count": stat.count,
+                "count_diff": getattr(stat, "count_diff", stat.count),
+            }
+            for stat in stats[:limit]
+        ]
+
+    async def diff(self, limit: int = 25, key_type: str = "lineno") -> Dict[str, Any]:
+        async with self._lock:
+            if not self.tracing:
+                tracemalloc.start(self.frames)
+                self._previous = self._previous_at = None
+            snapshot = await asyncio.to_thread(self._take)
+            top = await asyncio.to_thread(self._top, snapshot, self._previous, key_type, limit)
+            now = time.monotonic()
+            result = {
+                "baseline": self._previous is None,
+                "seconds_since_previous": None if self._previous_at is None else round(now - self._previous_at, 3),
+                "traced_bytes": tracemalloc.get_traced_memory()[0],
+                "top": top,
+            }
+            self._previous, self._previous_at = snapshot, now
+            return result
+
+    async def stop(self):
+        async with self._lock:
+            if self.tracing:
+                tracemalloc.stop()
+            self._previous = self._previous_at = None
+
+
+# Global diagnostics instances
+loop_block_detector = LoopBlockDetector(threshold=settings.loop_block_threshold)
+sampling_profiler = SamplingProfiler()
+allocation_tracker = AllocationTracker(frames=settings.memory_profiler_frames)
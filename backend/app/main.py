@@ -4,17 +4,55 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from database.connection import engine, Base
-from routers import auth, users, health, gw2
+from app.diagnostics import loop_block_detector
+from app.metrics import MetricsMiddleware, loop_lag_monitor, mark_process_dead
+from app.middleware import ResponseHeadersMiddleware
+from database.connection import engine, async_engine, Base, create_missing_indexes
+from routers import auth, users, health, gw2, metrics, admin
+from services.gw2_service import gw2_service
+from services.gw2_build_watcher import build_watcher
+from services.gw2_catalog_sync import catalog_mirror
+from services.gw2_compact_catalog import compact_catalogs
+from services.gw2_warmup import cache_warmer
+from services.write_behind import write_behind
 
 # Create database tables
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
+    if settings.metrics_enabled:
+        await loop_lag_monitor.start()
+    if settings.loop_block_detector_enabled:
+        await loop_block_detector.start()
+    await write_behind.start()
+    await gw2_service.start()
+    await cache_warmer.load_snapshot()
+    if settings.gw2_catalog_mirror_enabled:
+        build_watcher.add_listener(catalog_mirror.on_build_changed)
+        await catalog_mirror.start()
+    if settings.gw2_compact_catalog_enabled:
+        build_watcher.add_listener(compact_catalogs.on_build_changed)
+        catalog_mirror.add_listener(compact_catalogs.on_catalog_synced)
+        await compact_catalogs.start()
+    if settings.gw2_build_watch_enabled:
+        await build_watcher.start()
+    # O readiness probe só responde "ready" depois do aquecimento
+    cache_warmer.start()
     yield
     # Shutdown
-    pass
+    await cache_warmer.stop()
+    await build_watcher.stop()
+    await catalog_mirror.stop()
+    await compact_catalogs.stop()
+    await cache_warmer.save_snapshot()
+    await gw2_service.close()
+    await write_behind.stop()
+    await async_engine.dispose()
+    await loop_lag_monitor.stop()
+    await loop_block_detector.stop()
+    mark_process_dead()
 
 # Create FastAPI app
 app = FastAPI(
@@ -31,8 +69,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-GW2-Failed-Ids-Count", "X-GW2-Build", "X-GW2-Stale"],
 )
 
+# Add middleware that applies headers set by the service layer
+app.add_middleware(ResponseHeadersMiddleware)
+
+# Add request latency metrics per route template
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, routes_app=app)
+
 # Add trusted host middleware
 app.add_middleware(
     TrustedHostMiddleware,
@@ -44,6 +90,9 @@ app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(gw2.router)
+app.include_router(admin.router)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
 
 # Root endpoint
 @app.get("/")
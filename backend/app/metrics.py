@@ -0,0 +1,167 @@
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Set
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge, Histogram, multiprocess
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Request latency per route template (never the raw path, to keep label cardinality bounded)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+# Upstream GW2 calls, labeled by endpoint without ids or names (e.g. "items", "account/bank")
+UPSTREAM_LATENCY = Histogram(
+    "gw2_upstream_request_duration_seconds",
+    "Latency of requests to the Guild Wars 2 API",
+    ["endpoint", "status"],
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the async database pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a periodic event loop callback was due and when it ran",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# With several workers the scrape reports the highest lag among the live ones
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds", "Most recent event loop lag measurement", multiprocess_mode="livemax"
+)
+
+
+def multiprocess_enabled() -> bool:
+    """Whether prometheus_client shares metric values across workers through PROMETHEUS_MULTIPROC_DIR."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def scrape_registry(*collectors) -> CollectorRegistry:
+    """Registry to expose at /metrics.
+
+    Single process: the default registry. With PROMETHEUS_MULTIPROC_DIR set (one directory
+    per deployment, emptied before the workers start), the metrics above are aggregated
+    from every worker; the extra collectors only see the worker that answers the scrape.
+    """
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in collectors:
+        registry.register(collector)
+    return registry
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the multiprocess directory on shutdown."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# The passthrough route accepts arbitrary paths, so the set of endpoint labels is capped
+MAX_UPSTREAM_ENDPOINT_LABELS = 256
+_upstream_endpoints: Set[str] = set()
+
+
+def observe_upstream(endpoint: str, status: Any, duration: float):
+    """Record one upstream GW2 request."""
+    if endpoint not in _upstream_endpoints:
+        if len(_upstream_endpoints) >= MAX_UPSTREAM_ENDPOINT_LABELS:
+            endpoint = "other"
+        else:
+            _upstream_endpoints.add(endpoint)
+    UPSTREAM_LATENCY.labels(endpoint, str(status)).observe(duration)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records request latency per route template."""
+
+    def __init__(self, app, routes_app=None):
+        self.app = app
+        # The FastAPI application whose routes are used to resolve templates
+        self.routes_app = routes_app
+        self._templates: Optional[Dict[Callable, str]] = None
+
+    def _route_template(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._templates is None:
+            routes = getattr(self.routes_app, "routes", [])
+            self._templates = {
+                route.endpoint: route.path
+                for route in routes if hasattr(route, "endpoint") and hasattr(route, "path")
+            }
+        return self._templates.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(
+                scope["method"], self._route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+
+class EventLoopLagMonitor:
+    """Periodically measures how late the event loop runs a scheduled wake-up."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_LAST.set(lag)
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global event loop lag monitor
+loop_lag_monitor = EventLoopLagMonitor()
@@ -0,0 +1,41 @@
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Headers collected while a request is being handled, so the service layer can
+# report metadata (partial failures, cache state, ...) without touching the route
+_response_headers: ContextVar[Optional[Dict[str, str]]] = ContextVar("response_headers", default=None)
+
+
+def set_response_header(name: str, value: str):
+    """Add a header to the response of the request currently being handled."""
+    headers = _response_headers.get()
+    if headers is not None:
+        headers[name] = value
+
+
+class ResponseHeadersMiddleware:
+    """ASGI middleware that applies headers registered through set_response_header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers: Dict[str, str] = {}
+        token = _response_headers.set(headers)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and headers:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers.items()
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _response_headers.reset(token)
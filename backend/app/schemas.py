@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # User schemas
@@ -30,6 +30,10 @@ class UserInDB(UserBase):
 class User(UserInDB):
     pass
 
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
+
 # Auth schemas
 class Token(BaseModel):
     access_token: str
@@ -1,25 +1,113 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import HTTPException, status
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# bcrypt releases the GIL, so a thread pool spreads hashing across cores without blocking the event loop
+_password_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="bcrypt")
+
+_password_stats_lock = threading.Lock()
+_password_stats: Dict[str, Any] = {
+    "queued": 0,
+    "running": 0,
+    "completed": 0,
+    "rehashed": 0,
+    "total_wait": 0.0,
+    "max_wait": 0.0,
+    "total_duration": 0.0,
+}
+
+def _encode_password(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes of the password
+    return password.encode('utf-8')[:72]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     try:
-        # Truncate password to 72 bytes to avoid bcrypt limitation
-        truncated_password = plain_password[:72].encode('utf-8')
-        return bcrypt.checkpw(truncated_password, hashed_password.encode('utf-8'))
+        return bcrypt.checkpw(_encode_password(plain_password), hashed_password.encode('utf-8'))
     except Exception:
         return False
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    # Truncate password to 72 bytes to avoid bcrypt limitation
-    truncated_password = password[:72].encode('utf-8')
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(truncated_password, salt).decode('utf-8')
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(_encode_password(password), salt).decode('utf-8')
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was created with a bcrypt cost other than the configured one."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
+
+async def _run_password_task(function: Callable[..., Any], *args: Any) -> Any:
+    """Run a bcrypt operation in the password thread pool, recording queue metrics."""
+    queued_at = time.monotonic()
+    # Guarded by _password_stats_lock; a job abandoned before it starts is removed from the queue once
+    state = {"started": False, "abandoned": False}
+    with _password_stats_lock:
+        _password_stats["queued"] += 1
+    
+    def task():
+        started_at = time.monotonic()
+        wait = started_at - queued_at
+        with _password_stats_lock:
+            if state["abandoned"]:
+                return None
+            state["started"] = True
+            _password_stats["queued"] -= 1
+            _password_stats["running"] += 1
+            _password_stats["total_wait"] += wait
+            _password_stats["max_wait"] = max(_password_stats["max_wait"], wait)
+        try:
+            return function(*args)
+        finally:
+            with _password_stats_lock:
+                _password_stats["running"] -= 1
+                _password_stats["completed"] += 1
+                _password_stats["total_duration"] += time.monotonic() - started_at
+    
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, task)
+    except BaseException:
+        # Cancelled (e.g. client disconnect) before a worker picked the job up
+        with _password_stats_lock:
+            if not state["started"] and not state["abandoned"]:
+                state["abandoned"] = True
+                _password_stats["queued"] -= 1
+        raise
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_password_task(get_password_hash, password)
+
+def password_hashing_stats() -> Dict[str, Any]:
+    """Return queue and timing metrics for the password thread pool."""
+    completed = _password_stats["completed"]
+    return {
+        "workers": settings.password_hash_workers,
+        "bcrypt_rounds": settings.bcrypt_rounds,
+        "queued": _password_stats["queued"],
+        "running": _password_stats["running"],
+        "completed": completed,
+        "rehashed": _password_stats["rehashed"],
+        "avg_wait": _password_stats["total_wait"] / completed if completed else 0.0,
+        "max_wait": _password_stats["max_wait"],
+        "avg_duration": _password_stats["total_duration"] / completed if completed else 0.0,
+    }
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -44,16 +132,34 @@ def verify_token(token: str) -> Optional[str]:
     except JWTError:
         return None
 
-def authenticate_user(db, email: str, password: str):
+async def _rehash_password(db, user, password: str):
+    """Store a hash with the configured bcrypt cost; failures keep the old hash and don't block the login."""
+    user_id = user.id
+    try:
+        user.hashed_password = await get_password_hash_async(password)
+        await db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to upgrade password hash for user {user_id}: {str(e)}")
+        await db.rollback()
+    else:
+        with _password_stats_lock:
+            _password_stats["rehashed"] += 1
+    await db.refresh(user)
+
+async def authenticate_user(db, email: str, password: str):
     """Authenticate a user with email and password."""
+    from sqlalchemy import select
     from models.user import User
     
     try:
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email).limit(1))
         if not user:
             return False
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return False
+        # Transparently upgrade hashes created with a different bcrypt cost
+        if password_needs_rehash(user.hashed_password):
+            await _rehash_password(db, user, password)
         return user
     except Exception:
         return False
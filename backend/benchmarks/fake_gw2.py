@@ -0,0 +1,236 @@
+import asyncio
+import copy
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from services.gw2_service import metrics_endpoint
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Endpoints que exigem access_token, como na API real
+AUTHENTICATED_ENDPOINTS = ("account", "characters", "tokeninfo", "commerce/transactions", "commerce/delivery")
+
+
+class FakeGW2API:
+    """Substituto local da API do GW2 para os benchmarks.
+
+    Responde a partir das fixtures gravadas em `fixtures/` (um arquivo por endpoint, com
+    "/" trocado por "_"). Itens e skins fora das fixtures são gerados a partir delas para
+    os ids de 1 a `catalog_size`; ids acima disso respondem 404. A paginação (`page` e
+    `page_size`) percorre os mesmos ids, como a API real. Preços do Trading Post
+    são gerados de forma determinística a partir do id.
+
+    A latência (`latency_ms` ± `jitter_ms`), a taxa de erros 503 (`error_rate`) e o limite
+    de requisições por minuto (acima dele a resposta é 429, com Retry-After opcional)
+    são configuráveis. Todas as chamadas recebidas são contadas por endpoint e status.
+    """
+
+    def __init__(
+        self,
+        fixtures_dir: str = FIXTURES_DIR,
+        catalog_size: int = 20000,
+        latency_ms: float = 40.0,
+        jitter_ms: float = 20.0,
+        error_rate: float = 0.0,
+        rate_limit_per_minute: int = 0,
+        retry_after: int = 0,
+        seed: int = 1,
+    ):
+        self.catalog_size = catalog_size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.retry_after = retry_after
+        self.fixtures = self._load_fixtures(fixtures_dir)
+        self._catalogs = {
+            name: {entry["id"]: entry for entry in self.fixtures.get(name, [])}
+            for name in ("items", "skins")
+        }
+        self._rng = random.Random(seed)
+        self._tokens = float(rate_limit_per_minute)
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._calls: Counter = Counter()
+        self._statuses: Counter = Counter()
+        self.app = Starlette(routes=[Route("/v2/{endpoint:path}", self._handle)])
+
+    def _load_fixtures(self, fixtures_dir: str) -> Dict[str, Any]:
+        fixtures = {}
+        for filename in sorted(os.listdir(fixtures_dir)):
+            if filename.endswith(".json"):
+                with open(os.path.join(fixtures_dir, filename), encoding="utf-8") as fixture:
+                    fixtures[filename[:-len(".json")].replace("_", "/")] = json.load(fixture)
+        return fixtures
+
+    # Contadores
+    def reset_counters(self):
+        with self._lock:
+            self._calls.clear()
+            self._statuses.clear()
+
+    def counters(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": sum(self._calls.values()),
+                "by_endpoint": dict(sorted(self._calls.items())),
+                "by_status": {str(status): count for status, count in sorted(self._statuses.items())},
+            }
+
+    def _record(self, endpoint: str, status: int):
+        with self._lock:
+            self._calls[metrics_endpoint(endpoint)] += 1
+            self._statuses[status] += 1
+
+    # Falhas simuladas
+    def _throttled(self) -> bool:
+        if self.rate_limit_per_minute <= 0:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            rate = self.rate_limit_per_minute / 60.0
+            self._tokens = min(float(self.rate_limit_per_minute), self._tokens + (now - self._refilled_at) * rate)
+            self._refilled_at = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+            return False
+
+    def _failed(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    # Dados
+    def _catalog_entry(self, catalog: str, entry_id: int) -> Optional[Dict[str, Any]]:
+        entries = self._catalogs[catalog]
+        if entry_id in entries:
+            return entries[entry_id]
+        if not 1 <= entry_id <= self.catalog_size or not entries:
+            return None
+        templates = self.fixtures[catalog]
+        entry = copy.deepcopy(templates[entry_id % len(templates)])
+        entry["id"] = entry_id
+        entry["name"] = f"{entry['name']} #{entry_id}"
+        entry.pop("chat_link", None)
+        return entry
+
+    def _price(self, item_id: int) -> Optional[Dict[str, Any]]:
+        if not 1 <= item_id <= self.catalog_size and item_id not in self._catalogs["items"]:
+            return None
+        unit_price = 100 + (item_id * 7919) % 50000
+        return {
+            "id": item_id,
+            "whitelisted": False,
+            "buys": {"quantity": (item_id * 31) % 20000, "unit_price": unit_price},
+            "sells": {"quantity": (item_id * 17) % 15000, "unit_price": unit_price + unit_price // 10 + 1},
+        }
+
+    def _lookup(self, endpoint: str, entry_id: int) -> Optional[Dict[str, Any]]:
+        if endpoint in self._catalogs:
+            return self._catalog_entry(endpoint, entry_id)
+        if endpoint == "commerce/prices":
+            return self._price(entry_id)
+        return None
+
+    def _page(self, endpoint: str, page: int, page_size: int) -> Tuple[int, Any]:
+        first = page * page_size + 1
+        if page < 0 or not 1 <= page_size <= 200 or first > self.catalog_size:
+            return 400, {"text": f"page out of range. Use page values 0 - {(self.catalog_size - 1) // max(page_size, 1)}."}
+        last = min(first + page_size - 1, self.catalog_size)
+        return 200, [self._lookup(endpoint, entry_id) for entry_id in range(first, last + 1)]
+
+    def _respond(self, endpoint: str, ids: Optional[str], page: Optional[str] = None, page_size: Optional[str] = None) -> Tuple[int, Any]:
+        if endpoint in ("items", "skins", "commerce/prices"):
+            if ids is None and page is not None:
+                return self._page(endpoint, int(page), int(page_size or 50))
+            if ids is None:
+                return 200, list(range(1, self.catalog_size + 1))
+            found = [
+                entry for entry in (
+                    self._lookup(endpoint, int(entry_id)) for entry_id in ids.split(",") if entry_id.isdigit()
+                ) if entry is not None
+            ]
+            if not found:
+                return 404, {"text": "all ids provided are invalid"}
+            return (206 if len(found) < len(ids.split(",")) else 200), found
+
+        resource, _, entry_id = endpoint.rpartition("/")
+        if resource in ("items", "skins", "commerce/prices") and entry_id.isdigit():
+            entry = self._lookup(resource, int(entry_id))
+            return (200, entry) if entry is not None else (404, {"text": "no such id"})
+
+        if endpoint in self.fixtures:
+            return 200, self.fixtures[endpoint]
+        if endpoint.startswith("characters/"):
+            name = endpoint[len("characters/"):]
+            for character in self.fixtures.get("characters", []):
+                if character["name"] == name:
+                    return 200, character
+        return 404, {"text": "no such endpoint"}
+
+    async def _handle(self, request: Request) -> Response:
+        endpoint = request.path_params["endpoint"].strip("/")
+        await asyncio.sleep(self._delay())
+
+        if self._throttled():
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after else None
+            status, body = 429, {"text": "too many requests"}
+        elif self._failed():
+            headers, status, body = None, 503, {"text": "API not active"}
+        elif endpoint.startswith(AUTHENTICATED_ENDPOINTS) and not request.query_params.get("access_token"):
+            headers, status, body = None, 401, {"text": "Invalid access token"}
+        else:
+            headers = None
+            params = request.query_params
+            status, body = self._respond(endpoint, params.get("ids"), params.get("page"), params.get("page_size"))
+
+        self._record(endpoint, status)
+        return JSONResponse(body, status_code=status, headers=headers)
+
+
+class FakeGW2Server:
+    """Executa a FakeGW2API com o uvicorn em uma thread própria, fora do loop da aplicação."""
+
+    def __init__(self, api: FakeGW2API, port: int, host: str = "127.0.0.1"):
+        self.api = api
+        self.host = host
+        self.port = port
+        self._server = uvicorn.Server(uvicorn.Config(
+            api.app, host=self.host, port=self.port, loop="asyncio",
+            lifespan="off", access_log=False, log_level="warning",
+        ))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v2"
+
+    def start(self, timeout: float = 10.0):
+        self._thread = threading.Thread(target=self._server.run, name="fake-gw2-api", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Não foi possível iniciar a API falsa do GW2")
+            time.sleep(0.01)
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
@@ -0,0 +1,264 @@
+"""Benchmark de carga da API com um substituto local da API do GW2.
+
+Uso (a partir de backend/, com o Postgres do docker-compose disponível):
+
+    python -m benchmarks.run --output resultados.json
+    python -m benchmarks.run --scenarios catalog,commerce_burst --baseline resultados.json
+
+A aplicação roda no mesmo processo (via httpx.ASGITransport, com o lifespan completo) e
+conversa por HTTP com a API falsa do GW2, que roda em outra thread. Os resultados são
+impressos em JSON: vazão, latências p50/p95/p99 e chamadas ao upstream por cenário.
+Com --baseline, o processo termina com código 1 se alguma métrica piorar além de --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import httpx
+from benchmarks.scenarios import SCENARIOS, PlannedRequest, ScenarioOptions
+
+APP_BASE_URL = "http://localhost"
+
+# Métricas comparadas com o baseline e se um valor maior é melhor
+REGRESSION_METRICS = (
+    ("throughput_rps", True),
+    ("latency_ms.p95", False),
+    ("latency_ms.p99", False),
+    ("upstream.calls", False),
+)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de carga da API TaimiLab")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Cenários separados por vírgula")
+    parser.add_argument("--requests", type=int, default=None, help="Requisições por cenário (padrão: o de cada cenário)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--catalog-size", type=int, default=20000)
+    parser.add_argument("--accounts", type=int, default=50, help="Chaves de API distintas no cenário account_snapshot")
+    parser.add_argument("--login-users", type=int, default=20, help="Usuários criados para o cenário login_storm")
+    parser.add_argument("--upstream-latency-ms", type=float, default=40.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="Fração de respostas 503 do upstream")
+    parser.add_argument("--upstream-rate-limit", type=int, default=0, help="Requisições por minuto antes de 429 (0 desativa)")
+    parser.add_argument("--upstream-retry-after", type=int, default=0, help="Retry-After das respostas 429 (0 omite o header)")
+    parser.add_argument("--output", default="-", help="Arquivo JSON de saída ('-' para stdout)")
+    parser.add_argument("--baseline", default=None, help="Resultado anterior para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Piora relativa tolerada em relação ao baseline")
+    parser.add_argument("--log-level", default="error")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios.split(",") if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(SCENARIOS)})")
+    return args
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+def configure_environment(upstream_url: str, data_dir: str):
+    """Aponta a aplicação para a API falsa; precisa rodar antes de importar app.config"""
+    os.environ["GW2_API_BASE_URL"] = upstream_url
+    # "development" ativa o echo do SQLAlchemy, o que distorce as medições
+    os.environ["ENVIRONMENT"] = "benchmark"
+    # Cada execução começa com os caches vazios para que os resultados sejam comparáveis
+    os.environ["GW2_CACHE_SNAPSHOT_ENABLED"] = "false"
+    os.environ["GW2_DISK_CACHE_PATH"] = os.path.join(data_dir, "gw2_cache.sqlite3")
+    # O limite de 300/min da API real dominaria as latências; o 429 é simulado pela API falsa
+    # (--upstream-rate-limit). Defina as variáveis no ambiente para medir com o limite real.
+    os.environ.setdefault("GW2_RATE_LIMIT_PER_MINUTE", "60000")
+    os.environ.setdefault("GW2_RATE_LIMIT_BURST", "60000")
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    values = sorted(latency * 1000 for latency in latencies)
+    if len(values) >= 2:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = values[0] if values else 0.0
+    return {
+        "mean": round(statistics.fmean(values), 3) if values else 0.0,
+        "p50": round(p50, 3),
+        "p95": round(p95, 3),
+        "p99": round(p99, 3),
+        "max": round(values[-1], 3) if values else 0.0,
+    }
+
+
+async def execute(client: httpx.AsyncClient, plan: List[PlannedRequest], concurrency: int, burst: bool) -> Dict[str, Any]:
+    """Envia o plano de requisições e mede a latência de cada uma"""
+    latencies = [0.0] * len(plan)
+    statuses: Counter = Counter()
+
+    async def send(index: int):
+        request = plan[index]
+        started = time.perf_counter()
+        try:
+            response = await client.request(request.method, request.url, params=request.params or None, json=request.json)
+            status = str(response.status_code)
+        except Exception as e:
+            status = type(e).__name__
+        latencies[index] = time.perf_counter() - started
+        statuses[status] += 1
+
+    started = time.perf_counter()
+    if burst:
+        for start in range(0, len(plan), concurrency):
+            await asyncio.gather(*(send(index) for index in range(start, min(start + concurrency, len(plan)))))
+    else:
+        pending = iter(range(len(plan)))
+
+        async def worker():
+            for index in pending:
+                await send(index)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(plan),
+        "duration_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(plan) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": latency_summary(latencies),
+        "status_codes": dict(sorted(statuses.items())),
+        # Exceções e 5xx; 4xx esperados (404 de ids inexistentes, 401 de senha errada) não contam
+        "errors": sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 500),
+    }
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while (await client.get("/health/ready")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError("A aplicação não ficou pronta (aquecimento do cache) a tempo")
+        await asyncio.sleep(0.1)
+
+
+async def run_scenarios(args: argparse.Namespace, upstream) -> Dict[str, Any]:
+    from app.main import app
+
+    options = ScenarioOptions(
+        catalog_size=args.catalog_size,
+        accounts=args.accounts,
+        login_users=args.login_users,
+    )
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url=APP_BASE_URL, timeout=None) as client:
+            await wait_until_ready(client)
+            for name in args.scenarios.split(","):
+                scenario = SCENARIOS[name](options)
+                try:
+                    await scenario.setup(client)
+                    plan = scenario.plan(args.requests or scenario.default_requests, args.seed)
+                    upstream.api.reset_counters()
+                    log(f"Executando {name}: {len(plan)} requisições, concorrência {args.concurrency}")
+                    result = await execute(client, plan, args.concurrency, scenario.burst)
+                finally:
+                    await scenario.teardown(client)
+                results[name] = {
+                    "description": scenario.description,
+                    "concurrency": args.concurrency,
+                    "burst": scenario.burst,
+                    **result,
+                    "upstream": upstream.api.counters(),
+                }
+    return results
+
+
+def metric_value(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS:
+            current, reference = metric_value(result, metric), metric_value(previous, metric)
+            if current is None or reference is None:
+                continue
+            if higher_is_better:
+                regressed = current < reference * (1 - tolerance)
+            else:
+                regressed = current > reference * (1 + tolerance)
+            if regressed:
+                regressions.append({"scenario": name, "metric": metric, "baseline": reference, "current": current})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), stream=sys.stderr)
+
+    port = free_port()
+    with tempfile.TemporaryDirectory(prefix="taimilab-benchmark-") as data_dir:
+        configure_environment(f"http://127.0.0.1:{port}/v2", data_dir)
+        from benchmarks.fake_gw2 import FakeGW2API, FakeGW2Server
+
+        upstream = FakeGW2Server(FakeGW2API(
+            catalog_size=args.catalog_size,
+            latency_ms=args.upstream_latency_ms,
+            jitter_ms=args.upstream_jitter_ms,
+            error_rate=args.upstream_error_rate,
+            rate_limit_per_minute=args.upstream_rate_limit,
+            retry_after=args.upstream_retry_after,
+            seed=args.seed,
+        ), port=port)
+        upstream.start()
+        try:
+            results = asyncio.run(run_scenarios(args, upstream))
+        finally:
+            upstream.stop()
+
+    report: Dict[str, Any] = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "log_level")},
+        "scenarios": results,
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            report["regressions"] = find_regressions(results, json.load(baseline), args.tolerance)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as destination:
+            destination.write(output + "\n")
+
+    if report.get("regressions"):
+        log(f"{len(report['regressions'])} regressões em relação ao baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
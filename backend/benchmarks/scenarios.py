@@ -0,0 +1,148 @@
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import httpx
+
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+@dataclass
+class PlannedRequest:
+    method: str
+    url: str
+    json: Optional[Dict[str, Any]] = None
+    params: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class ScenarioOptions:
+    catalog_size: int = 20000
+    accounts: int = 50
+    login_users: int = 20
+    batch_size: int = 50
+
+
+class Scenario:
+    """Mistura de requisições de um cenário de carga.
+
+    O plano de requisições é gerado antes da execução com um `random.Random` semeado,
+    então duas execuções com a mesma semente enviam exatamente as mesmas requisições.
+    Cenários com `burst = True` são executados em ondas: cada onda dispara `concurrency`
+    requisições ao mesmo tempo, como acontece com vários usuários abrindo a mesma tela.
+    """
+
+    name = ""
+    description = ""
+    default_requests = 2000
+    burst = False
+
+    def __init__(self, options: ScenarioOptions):
+        self.options = options
+
+    async def setup(self, client: httpx.AsyncClient):
+        """Prepara os dados necessários antes da medição (não entra nos resultados)"""
+
+    async def teardown(self, client: httpx.AsyncClient):
+        """Remove os dados criados em setup; roda mesmo se a medição falhar"""
+
+    def next_request(self, rng: random.Random) -> PlannedRequest:
+        raise NotImplementedError
+
+    def plan(self, requests: int, seed: int) -> List[PlannedRequest]:
+        rng = random.Random(f"{self.name}:{seed}")
+        return [self.next_request(rng) for _ in range(requests)]
+
+    def _popular_id(self, rng: random.Random) -> int:
+        # Distribuição concentrada nos ids baixos: poucos itens recebem a maior parte dos acessos
+        return int(self.options.catalog_size * rng.random() ** 3) + 1
+
+
+class CatalogScenario(Scenario):
+    name = "catalog"
+    description = "Consultas ao catálogo de itens e skins (individuais e em lote), com 2% de ids inexistentes"
+
+    def next_request(self, rng: random.Random) -> PlannedRequest:
+        roll = rng.random()
+        if roll < 0.02:
+            return PlannedRequest("GET", f"/gw2/items/{self.options.catalog_size + rng.randint(1, 1000)}")
+        if roll < 0.80:
+            return PlannedRequest("GET", f"/gw2/items/{self._popular_id(rng)}")
+        if roll < 0.95:
+            ids = sorted({self._popular_id(rng) for _ in range(rng.randint(10, self.options.batch_size))})
+            return PlannedRequest("GET", "/gw2/items", params={"ids": ",".join(map(str, ids))})
+        return PlannedRequest("GET", f"/gw2/skins/{self._popular_id(rng)}")
+
+
+class AccountSnapshotScenario(Scenario):
+    name = "account_snapshot"
+    description = "Snapshots de conta (conta, personagens, carteira, banco, materiais e tokeninfo) de várias chaves de API"
+    default_requests = 1000
+
+    def next_request(self, rng: random.Random) -> PlannedRequest:
+        api_key = f"benchmark-key-{rng.randrange(self.options.accounts)}"
+        return PlannedRequest("GET", "/gw2/account/snapshot", params={"api_key": api_key})
+
+
+class CommerceBurstScenario(Scenario):
+    name = "commerce_burst"
+    description = "Rajadas de consultas de preços do Trading Post para cestas de itens populares"
+    burst = True
+
+    def next_request(self, rng: random.Random) -> PlannedRequest:
+        ids = sorted({self._popular_id(rng) for _ in range(rng.randint(1, self.options.batch_size))})
+        return PlannedRequest("GET", "/gw2/commerce/prices", params={"ids": ",".join(map(str, ids))})
+
+
+class LoginStormScenario(Scenario):
+    name = "login_storm"
+    description = "Rajadas de logins simultâneos, com 5% de senhas incorretas"
+    default_requests = 200
+    burst = True
+
+    def __init__(self, options: ScenarioOptions):
+        super().__init__(options)
+        # Usuários criados por esta execução, removidos em teardown
+        self.created_emails: List[str] = []
+
+    def _email(self, index: int) -> str:
+        return f"benchmark-{index}@taimilab.com"
+
+    async def setup(self, client: httpx.AsyncClient):
+        for index in range(self.options.login_users):
+            email = self._email(index)
+            response = await client.post("/users/", json={
+                "email": email,
+                "username": f"benchmark-{index}",
+                "password": BENCHMARK_PASSWORD,
+            })
+            # 400 indica que o usuário já existe (ex.: execução anterior interrompida); ele é mantido
+            if response.status_code == 200:
+                self.created_emails.append(email)
+            elif response.status_code != 400:
+                raise RuntimeError(f"Erro ao criar usuário de benchmark: HTTP {response.status_code}")
+
+    async def teardown(self, client: httpx.AsyncClient):
+        # Não há rota para excluir usuários (DELETE /users/me só desativa); remove direto no banco
+        from sqlalchemy import delete
+        from database.connection import AsyncSessionLocal
+        from models.user import User
+
+        if not self.created_emails:
+            return
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.email.in_(self.created_emails)))
+            await db.commit()
+        self.created_emails = []
+
+    def next_request(self, rng: random.Random) -> PlannedRequest:
+        password = BENCHMARK_PASSWORD if rng.random() >= 0.05 else "wrong-password"
+        return PlannedRequest("POST", "/auth/login", json={
+            "email": self._email(rng.randrange(self.options.login_users)),
+            "password": password,
+        })
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (CatalogScenario, AccountSnapshotScenario, CommerceBurstScenario, LoginStormScenario)
+}
@@ -1,7 +1,10 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.metrics import TimedAsyncQueuePool
 
 # Create database engine
 engine = create_engine(
@@ -14,9 +17,34 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) used by the request paths so queries don't block the event loop
+async_database_url = make_url(settings.database_url).set(drivername="postgresql+asyncpg").update_query_dict({
+    "prepared_statement_cache_size": str(settings.database_statement_cache_size),
+})
+async_engine = create_async_engine(
+    async_database_url,
+    poolclass=TimedAsyncQueuePool,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    connect_args={"statement_cache_size": settings.database_statement_cache_size},
+    echo=settings.environment == "development"
+)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
+def create_missing_indexes():
+    """create_all() only creates missing tables; also add indexes declared on existing ones."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -24,3 +52,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
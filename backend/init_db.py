@@ -11,14 +11,16 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from sqlalchemy.orm import Session
 from database.connection import SessionLocal, engine
 from models.user import User
+import models.gw2_models  # noqa: F401 - registra as tabelas do GW2 no Base
 from app.utils.auth import get_password_hash
 from app.config import settings
 
 def init_db():
     """Initialize database with sample data."""
     # Create tables
-    from database.connection import Base
+    from database.connection import Base, create_missing_indexes
     Base.metadata.create_all(bind=engine)
+    create_missing_indexes()
     
     # Create database session
     db = SessionLocal()
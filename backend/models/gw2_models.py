@@ -1,11 +1,9 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, JSON
-from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-
-Base = declarative_base()
+from database.connection import Base
 
 # SQLAlchemy Models
 class GW2Account(Base):
@@ -51,6 +49,16 @@ class GW2Achievement(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class GW2CatalogEntry(Base):
+    __tablename__ = "gw2_catalog_entries"
+    
+    resource = Column(String(50), primary_key=True)
+    entry_id = Column(Integer, primary_key=True)
+    data = Column(JSON, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    build_id = Column(Integer, nullable=True)
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 # Pydantic Models
 class GW2AccountCreate(BaseModel):
     api_key: str
@@ -177,6 +185,18 @@ class GW2APIItem(BaseModel):
     chat_link: Optional[str] = None
     details: Optional[Dict[str, Any]] = None
 
+class GW2AccountSnapshot(BaseModel):
+    account: Optional[Dict[str, Any]] = None
+    characters: Optional[List[Dict[str, Any]]] = None
+    wallet: Optional[List[Dict[str, Any]]] = None
+    bank: Optional[List[Optional[Dict[str, Any]]]] = None
+    materials: Optional[List[Dict[str, Any]]] = None
+    tokeninfo: Optional[Dict[str, Any]] = None
+    timings: Dict[str, float]
+    errors: Dict[str, str]
+    partial: bool
+    generated_at: datetime
+
 class GW2APIWorld(BaseModel):
     id: int
     name: str
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index
 from sqlalchemy.sql import func
 from database.connection import Base
 
@@ -16,5 +16,12 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
     
+    # Keyset pagination indexes for the /users/ listing, with and without filters
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+        Index("ix_users_is_verified_created_at_id", "is_verified", "created_at", "id"),
+    )
+    
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', username='{self.username}')>"
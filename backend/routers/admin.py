@@ -0,0 +1,100 @@
+import asyncio
+import tracemalloc
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from datetime import datetime
+from typing import Literal
+
+from app.config import settings
+from app.dependencies import get_current_admin_user
+from app.diagnostics import (
+    ProfilerBusyError, allocation_tracker, cache_footprint, deep_sizeof,
+    loop_block_detector, process_memory, sampling_profiler
+)
+from services.gw2_cache import key_endpoint
+from services.gw2_service import gw2_service, metrics_endpoint
+from services.user_cache import user_cache
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(get_current_admin_user)])
+
+@router.get("/diagnostics/loop")
+async def loop_diagnostics():
+    """Event loop block detector statistics, including the stack of the last stall."""
+    return {
+        "loop_block_detector": loop_block_detector.stats(),
+        "profiler": {"enabled": settings.profiler_enabled, "running": sampling_profiler.running},
+        "timestamp": datetime.utcnow()
+    }
+
+@router.post("/profile", response_class=PlainTextResponse)
+async def run_profile(
+    seconds: float = Query(10.0, gt=0, description="Profile duration in seconds"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Sampling interval in milliseconds"),
+    all_threads: bool = Query(False, description="Also sample worker threads, not only the event loop")
+):
+    """Run a time-boxed sampling profile and return collapsed stacks for flamegraph tools."""
+    if not settings.profiler_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiler is disabled"
+        )
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Profile duration is limited to {settings.profiler_max_seconds} seconds"
+        )
+    try:
+        stacks = await sampling_profiler.profile(seconds, interval_ms / 1000, all_threads)
+    except ProfilerBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    return PlainTextResponse(stacks)
+
+@router.get("/memory")
+async def memory_usage():
+    """Approximate memory per GW2 cache namespace and catalog, compact catalogs and process-level usage."""
+    user_cache_entries = user_cache.entries()
+    return {
+        "process": process_memory(),
+        "gw2_cache": await cache_footprint(
+            gw2_service.cache.entries(),
+            catalog=lambda key: metrics_endpoint(key_endpoint(key))
+        ),
+        "compact_catalogs": {
+            resource: catalog.memory_usage() for resource, catalog in gw2_service.compact_catalogs.items()
+        },
+        "user_cache": {
+            "entries": len(user_cache_entries),
+            "approx_bytes": await asyncio.to_thread(deep_sizeof, user_cache_entries),
+        },
+        "tracemalloc": {
+            "enabled": settings.memory_profiler_enabled,
+            "tracing": allocation_tracker.tracing,
+            "traced_bytes": tracemalloc.get_traced_memory()[0] if allocation_tracker.tracing else None,
+        },
+        "timestamp": datetime.utcnow()
+    }
+
+@router.post("/memory/snapshot")
+async def memory_snapshot(
+    limit: int = Query(25, ge=1, le=500, description="Number of allocation sites to return"),
+    group_by: Literal["lineno", "filename", "traceback"] = Query("lineno", description="How allocations are grouped")
+):
+    """Take a tracemalloc snapshot and diff it against the one from the previous call.
+
+    The first call starts tracing and returns the baseline; call again later to see growth.
+    """
+    if not settings.memory_profiler_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Memory profiler is disabled"
+        )
+    return await allocation_tracker.diff(limit, group_by)
+
+@router.delete("/memory/snapshot")
+async def stop_memory_tracing():
+    """Stop tracemalloc and discard the stored snapshot."""
+    await allocation_tracker.stop()
+    return {"tracing": False}
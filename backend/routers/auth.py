@@ -1,25 +1,24 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Optional
 
-from database.connection import get_db
+from database.connection import get_async_db
 from app.schemas import LoginRequest, LoginResponse, User, Token
-from app.utils.auth import authenticate_user, create_access_token, verify_token
+from app.utils.auth import authenticate_user, create_access_token
+from app.dependencies import get_current_user
 from services.user_service import UserService
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
-security = HTTPBearer()
 
 @router.post("/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token."""
     user_service = UserService(db)
     
     # Authenticate user
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user(db, login_data.email, login_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -43,7 +42,7 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     )
     
     # Update last login
-    user_service.update_last_login(user.id)
+    await user_service.update_last_login(user.id)
     
     return LoginResponse(
         access_token=access_token,
@@ -57,62 +56,17 @@ async def logout():
     return {"message": "Successfully logged out"}
 
 @router.get("/me", response_model=User)
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+async def get_me(current_user: User = Depends(get_current_user)):
     """Get current authenticated user."""
-    token = credentials.credentials
-    email = verify_token(token)
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user_service = UserService(db)
-    user = user_service.get_user_by_email(email)
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Account is deactivated"
-        )
-    
-    return user
+    return current_user
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
+async def refresh_token(current_user: User = Depends(get_current_user)):
     """Refresh access token."""
-    token = credentials.credentials
-    email = verify_token(token)
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
-    
-    user_service = UserService(db)
-    user = user_service.get_user_by_email(email)
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive"
-        )
-    
     # Create new access token
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": current_user.email}, expires_delta=access_token_expires
     )
     
     return Token(access_token=access_token, token_type="bearer")
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 from typing import Optional, List, Dict, Any
+import httpx
+import re
+from app.config import settings
 from services.gw2_service import gw2_service
+from services.gw2_errors import GW2NotFoundError
 from models.gw2_models import (
     GW2AccountCreate, GW2AccountResponse, GW2CharacterResponse,
     GW2AchievementResponse, GW2APIAccount, GW2APICharacter,
     GW2APIAchievement, GW2APIAchievementProgress, GW2APIItem,
-    GW2APIWorld, GW2APIBuild
+    GW2APIWorld, GW2APIBuild, GW2AccountSnapshot
 )
 # from utils.auth import get_current_user
 import logging
@@ -14,12 +18,27 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/gw2", tags=["Guild Wars 2"])
 
+# Caminhos aceitos pelo modo passthrough (ex.: continents/1/floors/1, characters/Nome)
+PASSTHROUGH_ENDPOINT = re.compile(r"^[\w\- .'%]+(/[\w\- .'%]+)*$")
+
+# Parâmetros repassados à API no modo passthrough; qualquer outro é rejeitado para não fragmentar o cache
+PASSTHROUGH_PARAMS = ("ids", "page", "page_size", "lang")
+
+def passthrough_allowed(endpoint: str) -> bool:
+    """Indica se o endpoint (ou um caminho abaixo dele) está na lista gw2_passthrough_endpoints"""
+    return any(
+        endpoint == allowed or endpoint.startswith(f"{allowed}/")
+        for allowed in settings.gw2_passthrough_endpoints_list
+    )
+
 # Endpoints públicos (não requerem autenticação)
 @router.get("/build", response_model=GW2APIBuild)
 async def get_build():
     """Retorna o ID da build atual do Guild Wars 2"""
     try:
         return await gw2_service.get_build()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter build: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -29,6 +48,8 @@ async def get_worlds():
     """Retorna lista de mundos do Guild Wars 2"""
     try:
         return await gw2_service.get_worlds()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter mundos: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -38,6 +59,8 @@ async def get_world_by_id(world_id: int):
     """Retorna informações de um mundo específico"""
     try:
         return await gw2_service.get_world_by_id(world_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter mundo {world_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -50,6 +73,8 @@ async def get_items(ids: Optional[str] = Query(None, description="IDs dos itens
         if ids:
             item_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_items(item_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter itens: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -59,6 +84,8 @@ async def get_item_by_id(item_id: int):
     """Retorna informações de um item específico"""
     try:
         return await gw2_service.get_item_by_id(item_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter item {item_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -71,6 +98,8 @@ async def get_achievements(ids: Optional[str] = Query(None, description="IDs das
         if ids:
             achievement_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_achievements(achievement_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter conquistas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -80,6 +109,8 @@ async def get_achievement_by_id(achievement_id: int):
     """Retorna informações de uma conquista específica"""
     try:
         return await gw2_service.get_achievement_by_id(achievement_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter conquista {achievement_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -89,6 +120,8 @@ async def get_daily_achievements():
     """Retorna conquistas diárias"""
     try:
         return await gw2_service.get_daily_achievements()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter conquistas diárias: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -98,6 +131,8 @@ async def get_tomorrow_achievements():
     """Retorna conquistas de amanhã"""
     try:
         return await gw2_service.get_tomorrow_achievements()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter conquistas de amanhã: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -110,6 +145,8 @@ async def get_achievement_groups(ids: Optional[str] = Query(None, description="I
         if ids:
             group_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_achievement_groups(group_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter grupos de conquistas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -122,6 +159,8 @@ async def get_achievement_categories(ids: Optional[str] = Query(None, descriptio
         if ids:
             category_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_achievement_categories(category_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter categorias de conquistas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -134,6 +173,8 @@ async def get_maps(ids: Optional[str] = Query(None, description="IDs dos mapas s
         if ids:
             map_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_maps(map_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter mapas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -143,6 +184,8 @@ async def get_map_by_id(map_id: int):
     """Retorna informações de um mapa específico"""
     try:
         return await gw2_service.get_map_by_id(map_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter mapa {map_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -155,6 +198,8 @@ async def get_continents(ids: Optional[str] = Query(None, description="IDs dos c
         if ids:
             continent_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_continents(continent_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter continentes: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -164,6 +209,8 @@ async def get_continent_by_id(continent_id: int):
     """Retorna informações de um continente específico"""
     try:
         return await gw2_service.get_continent_by_id(continent_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter continente {continent_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -173,6 +220,8 @@ async def get_races():
     """Retorna raças disponíveis"""
     try:
         return await gw2_service.get_races()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter raças: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -182,6 +231,8 @@ async def get_professions():
     """Retorna profissões disponíveis"""
     try:
         return await gw2_service.get_professions()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter profissões: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -194,6 +245,8 @@ async def get_skills(ids: Optional[str] = Query(None, description="IDs das habil
         if ids:
             skill_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_skills(skill_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter habilidades: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -203,6 +256,8 @@ async def get_skill_by_id(skill_id: int):
     """Retorna informações de uma habilidade específica"""
     try:
         return await gw2_service.get_skill_by_id(skill_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter habilidade {skill_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -215,6 +270,8 @@ async def get_traits(ids: Optional[str] = Query(None, description="IDs das carac
         if ids:
             trait_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_traits(trait_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter características: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -224,6 +281,8 @@ async def get_trait_by_id(trait_id: int):
     """Retorna informações de uma característica específica"""
     try:
         return await gw2_service.get_trait_by_id(trait_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter característica {trait_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -236,6 +295,8 @@ async def get_specializations(ids: Optional[str] = Query(None, description="IDs
         if ids:
             spec_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_specializations(spec_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter especializações: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -245,6 +306,8 @@ async def get_specialization_by_id(specialization_id: int):
     """Retorna informações de uma especialização específica"""
     try:
         return await gw2_service.get_specialization_by_id(specialization_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter especialização {specialization_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -254,6 +317,8 @@ async def get_legends():
     """Retorna lendas de revenant"""
     try:
         return await gw2_service.get_legends()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter lendas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -266,6 +331,8 @@ async def get_pets(ids: Optional[str] = Query(None, description="IDs dos pets se
         if ids:
             pet_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_pets(pet_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter pets: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -275,6 +342,8 @@ async def get_pet_by_id(pet_id: int):
     """Retorna informações de um pet específico"""
     try:
         return await gw2_service.get_pet_by_id(pet_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter pet {pet_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -284,6 +353,8 @@ async def get_mounts_types():
     """Retorna tipos de montarias"""
     try:
         return await gw2_service.get_mounts_types()
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter tipos de montarias: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -296,6 +367,8 @@ async def get_mounts_skins(ids: Optional[str] = Query(None, description="IDs das
         if ids:
             skin_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_mounts_skins(skin_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter skins de montarias: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -308,6 +381,8 @@ async def get_outfits(ids: Optional[str] = Query(None, description="IDs dos outf
         if ids:
             outfit_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_outfits(outfit_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter outfits: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -317,6 +392,8 @@ async def get_outfit_by_id(outfit_id: int):
     """Retorna informações de um outfit específico"""
     try:
         return await gw2_service.get_outfit_by_id(outfit_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter outfit {outfit_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -329,6 +406,8 @@ async def get_skins(ids: Optional[str] = Query(None, description="IDs das skins
         if ids:
             skin_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_skins(skin_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter skins: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -338,6 +417,8 @@ async def get_skin_by_id(skin_id: int):
     """Retorna informações de uma skin específica"""
     try:
         return await gw2_service.get_skin_by_id(skin_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter skin {skin_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -350,6 +431,8 @@ async def get_minis(ids: Optional[str] = Query(None, description="IDs dos minis
         if ids:
             mini_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_minis(mini_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter minis: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -359,6 +442,8 @@ async def get_mini_by_id(mini_id: int):
     """Retorna informações de um mini específico"""
     try:
         return await gw2_service.get_mini_by_id(mini_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter mini {mini_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -371,6 +456,8 @@ async def get_titles(ids: Optional[str] = Query(None, description="IDs dos títu
         if ids:
             title_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_titles(title_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter títulos: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -380,6 +467,8 @@ async def get_title_by_id(title_id: int):
     """Retorna informações de um título específico"""
     try:
         return await gw2_service.get_title_by_id(title_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter título {title_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -392,6 +481,8 @@ async def get_dyes(ids: Optional[str] = Query(None, description="IDs dos corante
         if ids:
             dye_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_dyes(dye_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter corantes: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -401,6 +492,8 @@ async def get_dye_by_id(dye_id: int):
     """Retorna informações de um corante específico"""
     try:
         return await gw2_service.get_dye_by_id(dye_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter corante {dye_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -413,6 +506,8 @@ async def get_currencies(ids: Optional[str] = Query(None, description="IDs das m
         if ids:
             currency_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_currencies(currency_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter moedas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -422,6 +517,8 @@ async def get_currency_by_id(currency_id: int):
     """Retorna informações de uma moeda específica"""
     try:
         return await gw2_service.get_currency_by_id(currency_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter moeda {currency_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -434,6 +531,8 @@ async def get_materials(ids: Optional[str] = Query(None, description="IDs dos ma
         if ids:
             material_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_materials(material_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter materiais: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -443,6 +542,8 @@ async def get_material_by_id(material_id: int):
     """Retorna informações de um material específico"""
     try:
         return await gw2_service.get_material_by_id(material_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter material {material_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -455,6 +556,8 @@ async def get_recipes(ids: Optional[str] = Query(None, description="IDs das rece
         if ids:
             recipe_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_recipes(recipe_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter receitas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -464,6 +567,8 @@ async def get_recipe_by_id(recipe_id: int):
     """Retorna informações de uma receita específica"""
     try:
         return await gw2_service.get_recipe_by_id(recipe_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter receita {recipe_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -473,6 +578,8 @@ async def search_recipes(input_item_id: int = Query(..., description="ID do item
     """Busca receitas por item de entrada"""
     try:
         return await gw2_service.search_recipes(input_item_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao buscar receitas para item {input_item_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -485,6 +592,8 @@ async def get_dungeons(ids: Optional[str] = Query(None, description="IDs das mas
         if ids:
             dungeon_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_dungeons(dungeon_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter masmorras: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -494,6 +603,8 @@ async def get_dungeon_by_id(dungeon_id: int):
     """Retorna informações de uma masmorra específica"""
     try:
         return await gw2_service.get_dungeon_by_id(dungeon_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter masmorra {dungeon_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -506,6 +617,8 @@ async def get_raids(ids: Optional[str] = Query(None, description="IDs das raids
         if ids:
             raid_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_raids(raid_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter raids: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -515,6 +628,8 @@ async def get_raid_by_id(raid_id: int):
     """Retorna informações de uma raid específica"""
     try:
         return await gw2_service.get_raid_by_id(raid_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter raid {raid_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -524,6 +639,8 @@ async def get_guild_by_id(guild_id: str):
     """Retorna informações de uma guilda específica"""
     try:
         return await gw2_service.get_guild_by_id(guild_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter guilda {guild_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -533,6 +650,8 @@ async def get_guild_emblem(guild_id: str):
     """Retorna emblema de uma guilda"""
     try:
         return await gw2_service.get_guild_emblem(guild_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter emblema da guilda {guild_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -545,6 +664,8 @@ async def get_guild_permissions(ids: Optional[str] = Query(None, description="ID
         if ids:
             permission_ids = [id.strip() for id in ids.split(",")]
         return await gw2_service.get_guild_permissions(permission_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter permissões de guilda: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -554,6 +675,8 @@ async def search_guilds(name: str = Query(..., description="Nome da guilda")):
     """Busca guildas por nome"""
     try:
         return await gw2_service.search_guilds(name)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao buscar guildas com nome '{name}': {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -566,6 +689,8 @@ async def get_guild_upgrades(ids: Optional[str] = Query(None, description="IDs d
         if ids:
             upgrade_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_guild_upgrades(upgrade_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter upgrades de guilda: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -576,15 +701,30 @@ async def get_account_info(api_key: str = Query(..., description="Chave de API d
     """Retorna informações da conta"""
     try:
         return await gw2_service.get_account_info(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter informações da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
 
+@router.get("/account/snapshot", response_model=GW2AccountSnapshot)
+async def get_account_snapshot(api_key: str = Query(..., description="Chave de API do Guild Wars 2")):
+    """Retorna conta, personagens, carteira, banco, materiais e tokeninfo em uma única resposta"""
+    try:
+        return await gw2_service.get_account_snapshot(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
+    except Exception as e:
+        logger.error(f"Erro ao obter snapshot da conta: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
 @router.get("/account/achievements")
 async def get_account_achievements(api_key: str = Query(..., description="Chave de API do Guild Wars 2")):
     """Retorna progresso das conquistas da conta"""
     try:
         return await gw2_service.get_account_achievements(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter conquistas da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -594,6 +734,8 @@ async def get_account_bank(api_key: str = Query(..., description="Chave de API d
     """Retorna banco da conta"""
     try:
         return await gw2_service.get_account_bank(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter banco da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -603,6 +745,8 @@ async def get_account_characters(api_key: str = Query(..., description="Chave de
     """Retorna lista de personagens da conta"""
     try:
         return await gw2_service.get_account_characters(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter personagens da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -612,6 +756,8 @@ async def get_character_info(character_name: str, api_key: str = Query(..., desc
     """Retorna informações de um personagem específico"""
     try:
         return await gw2_service.get_character_info(character_name, api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter informações do personagem {character_name}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -621,6 +767,8 @@ async def get_account_wallet(api_key: str = Query(..., description="Chave de API
     """Retorna carteira da conta"""
     try:
         return await gw2_service.get_account_wallet(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter carteira da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -630,6 +778,8 @@ async def get_account_materials(api_key: str = Query(..., description="Chave de
     """Retorna armazenamento de materiais da conta"""
     try:
         return await gw2_service.get_account_materials(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter materiais da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -639,6 +789,8 @@ async def get_account_dungeons(api_key: str = Query(..., description="Chave de A
     """Retorna masmorras completadas diariamente"""
     try:
         return await gw2_service.get_account_dungeons(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter masmorras da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -648,6 +800,8 @@ async def get_account_daily_crafting(api_key: str = Query(..., description="Chav
     """Retorna materiais criados diariamente"""
     try:
         return await gw2_service.get_account_daily_crafting(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter crafting diário da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -657,6 +811,8 @@ async def get_account_map_chests(api_key: str = Query(..., description="Chave de
     """Retorna baús de mapa coletados diariamente"""
     try:
         return await gw2_service.get_account_map_chests(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter baús de mapa da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -666,6 +822,8 @@ async def get_account_world_bosses(api_key: str = Query(..., description="Chave
     """Retorna chefes mundiais derrotados diariamente"""
     try:
         return await gw2_service.get_account_world_bosses(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter chefes mundiais da conta: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -675,6 +833,8 @@ async def get_token_info(api_key: str = Query(..., description="Chave de API do
     """Retorna informações sobre a chave de API"""
     try:
         return await gw2_service.get_token_info(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter informações do token: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -685,6 +845,8 @@ async def get_wvw_matches(world_id: Optional[int] = Query(None, description="ID
     """Retorna partidas WvW"""
     try:
         return await gw2_service.get_wvw_matches(world_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter partidas WvW: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -694,6 +856,8 @@ async def get_wvw_match_details(match_id: str):
     """Retorna detalhes de uma partida WvW"""
     try:
         return await gw2_service.get_wvw_match_details(match_id)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter detalhes da partida WvW {match_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -706,6 +870,8 @@ async def get_wvw_objectives(ids: Optional[str] = Query(None, description="IDs d
         if ids:
             objective_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_wvw_objectives(objective_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter objetivos WvW: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -718,6 +884,8 @@ async def get_wvw_ranks(ids: Optional[str] = Query(None, description="IDs dos ra
         if ids:
             rank_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_wvw_ranks(rank_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter ranks WvW: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -730,6 +898,8 @@ async def get_wvw_abilities(ids: Optional[str] = Query(None, description="IDs da
         if ids:
             ability_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_wvw_abilities(ability_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter habilidades WvW: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -742,6 +912,8 @@ async def get_wvw_upgrades(ids: Optional[str] = Query(None, description="IDs dos
         if ids:
             upgrade_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_wvw_upgrades(upgrade_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter upgrades WvW: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -755,6 +927,8 @@ async def get_trading_post_listings(ids: Optional[str] = Query(None, description
         if ids:
             item_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_trading_post_listings(item_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter listagens do Trading Post: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -767,6 +941,8 @@ async def get_trading_post_prices(ids: Optional[str] = Query(None, description="
         if ids:
             item_ids = [int(id.strip()) for id in ids.split(",")]
         return await gw2_service.get_trading_post_prices(item_ids)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter preços do Trading Post: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -776,6 +952,8 @@ async def get_exchange_coins_to_gems(coins: int = Query(..., description="Quanti
     """Retorna taxa de câmbio de moedas para gemas"""
     try:
         return await gw2_service.get_exchange_coins_to_gems(coins)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter taxa de câmbio moedas->gemas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -785,6 +963,8 @@ async def get_exchange_gems_to_coins(gems: int = Query(..., description="Quantid
     """Retorna taxa de câmbio de gemas para moedas"""
     try:
         return await gw2_service.get_exchange_gems_to_coins(gems)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter taxa de câmbio gemas->moedas: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -794,6 +974,8 @@ async def get_trading_post_transactions(api_key: str = Query(..., description="C
     """Retorna transações do Trading Post"""
     try:
         return await gw2_service.get_trading_post_transactions(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter transações do Trading Post: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
@@ -803,6 +985,66 @@ async def get_trading_post_delivery(api_key: str = Query(..., description="Chave
     """Retorna itens disponíveis para retirada"""
     try:
         return await gw2_service.get_trading_post_delivery(api_key)
+    except GW2NotFoundError:
+        raise HTTPException(status_code=404, detail="Recurso não encontrado")
     except Exception as e:
         logger.error(f"Erro ao obter delivery do Trading Post: {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor")
+
+# Passthrough: repassa os bytes da API sem decodificar, validar ou re-serializar
+@router.get("/raw/{endpoint:path}")
+async def get_raw_passthrough(
+    endpoint: str,
+    request: Request,
+    api_key: Optional[str] = Query(None, description="Chave de API do Guild Wars 2")
+):
+    """Retorna a resposta da API do Guild Wars 2 sem modificações (modo passthrough)"""
+    if not settings.gw2_passthrough_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    endpoint = endpoint.strip("/")
+    if not PASSTHROUGH_ENDPOINT.match(endpoint) or ".." in endpoint:
+        raise HTTPException(status_code=400, detail="Endpoint inválido")
+    if not passthrough_allowed(endpoint):
+        raise HTTPException(status_code=404, detail="Not Found")
+    
+    params = {
+        name: value for name, value in request.query_params.items()
+        if name not in ("api_key", "access_token")
+    }
+    unknown = sorted(name for name in params if name not in PASSTHROUGH_PARAMS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Parâmetros não permitidos: {', '.join(unknown)}")
+    
+    ids = params.get("ids")
+    try:
+        # Buscas por ids usam o cache por entrada e os lotes de _get_by_ids, como as rotas tipadas;
+        # ids que falharam são informados no header X-GW2-Failed-Ids-Count
+        if ids and ids != "all" and list(params) == ["ids"] and not api_key:
+            requested = [int(id) if id.isdigit() else id for id in ids.split(",") if id]
+            body = await gw2_service.get_raw_by_ids(endpoint, requested)
+            return Response(content=body, media_type="application/json; charset=utf-8")
+        payload = await gw2_service.get_payload(endpoint, params or None, api_key)
+    except GW2NotFoundError as e:
+        payload = e.payload
+        if payload is None:
+            raise HTTPException(status_code=404, detail="Recurso não encontrado")
+        return Response(content=payload.body, status_code=404, media_type=payload.content_type)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code < 500:
+            return Response(
+                content=e.response.content,
+                status_code=e.response.status_code,
+                media_type=e.response.headers.get("content-type"),
+            )
+        logger.error(f"Erro ao repassar {endpoint}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+    except Exception as e:
+        logger.error(f"Erro ao repassar {endpoint}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor")
+    
+    return Response(
+        content=payload.body,
+        status_code=payload.status_code,
+        media_type=payload.content_type,
+        headers=payload.headers,
+    )
@@ -1,6 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response
 from datetime import datetime
+from app.dependencies import get_current_admin_user
 from app.schemas import HealthCheck
+from app.utils.auth import password_hashing_stats
+from services.gw2_service import gw2_service
+from services.user_cache import user_cache
+from services.write_behind import write_behind
+from services.gw2_catalog_sync import catalog_mirror
+from services.gw2_compact_catalog import compact_catalogs
+from services.gw2_warmup import cache_warmer
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -14,10 +22,44 @@ async def health_check():
     )
 
 @router.get("/ready")
-async def readiness_check():
-    """Readiness check endpoint."""
+async def readiness_check(response: Response):
+    """Readiness check endpoint. Returns 503 until the GW2 cache warm-up has finished."""
+    if not cache_warmer.ready:
+        response.status_code = 503
+        return {
+            "status": "warming",
+            "message": "API is warming up its caches",
+            "warmup": cache_warmer.progress(),
+            "timestamp": datetime.utcnow()
+        }
     return {
         "status": "ready",
         "message": "API is ready to accept requests",
+        "warmup": cache_warmer.progress(),
+        "timestamp": datetime.utcnow()
+    }
+
+@router.get("/auth", dependencies=[Depends(get_current_admin_user)])
+async def auth_stats():
+    """Password hashing thread pool and authenticated-user cache statistics (admin only)."""
+    return {
+        "password_hashing": password_hashing_stats(),
+        "user_cache": user_cache.stats(),
+        "write_behind": write_behind.stats(),
+        "timestamp": datetime.utcnow()
+    }
+
+@router.get("/upstream", dependencies=[Depends(get_current_admin_user)])
+async def upstream_stats():
+    """Connection pool, cache, rate limiter and circuit breaker statistics for the Guild Wars 2 API client (admin only)."""
+    return {
+        "pool": gw2_service.get_pool_stats(),
+        "cache": gw2_service.cache.stats(),
+        "disk_cache": gw2_service.disk_cache.stats() if gw2_service.disk_cache is not None else None,
+        "batching": gw2_service.get_batching_stats(),
+        "rate_limiter": gw2_service.rate_limiter.stats(),
+        "circuit_breakers": gw2_service.circuit_breakers.stats(),
+        "catalog_mirror": catalog_mirror.stats(),
+        "compact_catalogs": compact_catalogs.stats(),
         "timestamp": datetime.utcnow()
     }
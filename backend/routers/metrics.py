@@ -0,0 +1,103 @@
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from app.config import settings
+from app.metrics import multiprocess_enabled, scrape_registry
+from database.connection import async_engine
+from services.gw2_service import gw2_service
+from services.user_cache import user_cache
+from services.write_behind import write_behind
+
+router = APIRouter(tags=["metrics"])
+
+
+class RuntimeStatsCollector:
+    """Exports counters the services already keep, read only at scrape time.
+
+    Nothing is added to the request hot path: cache, pool and buffer statistics
+    are collected from the in-process objects when Prometheus scrapes /metrics.
+    In multiprocess mode they describe the worker that answered the scrape.
+    """
+
+    def collect(self):
+        cache = gw2_service.cache
+        for name, value, help_text in (
+            ("gw2_cache_hits", cache.hits, "GW2 response cache hits"),
+            ("gw2_cache_misses", cache.misses, "GW2 response cache misses"),
+            ("gw2_cache_stale_hits", cache.stale_hits, "Stale GW2 responses served from the cache"),
+            ("gw2_cache_evictions", cache.evictions, "GW2 response cache evictions"),
+            ("gw2_cache_expirations", cache.expirations, "GW2 response cache expirations"),
+            ("gw2_cache_invalidations", cache.invalidations, "GW2 response cache invalidations"),
+        ):
+            yield CounterMetricFamily(name, help_text, value=value)
+        yield GaugeMetricFamily("gw2_cache_entries", "Entries in the GW2 response cache", value=len(cache))
+        yield GaugeMetricFamily("gw2_cache_bytes", "Bytes held by the GW2 response cache", value=cache._bytes)
+
+        disk_cache = gw2_service.disk_cache
+        if disk_cache is not None:
+            for name, value, help_text in (
+                ("gw2_disk_cache_hits", disk_cache.hits, "GW2 on-disk cache hits"),
+                ("gw2_disk_cache_misses", disk_cache.misses, "GW2 on-disk cache misses"),
+                ("gw2_disk_cache_evictions", disk_cache.evictions, "GW2 on-disk cache evictions"),
+                ("gw2_disk_cache_errors", disk_cache.errors, "GW2 on-disk cache errors"),
+            ):
+                yield CounterMetricFamily(name, help_text, value=value)
+
+        yield CounterMetricFamily(
+            "gw2_coalesced_requests", "GW2 requests served by an in-flight upstream call",
+            value=gw2_service._coalesced_requests,
+        )
+        yield GaugeMetricFamily("gw2_upstream_in_flight", "GW2 upstream requests in flight", value=gw2_service._in_flight)
+
+        limiter = gw2_service.rate_limiter
+        yield GaugeMetricFamily("gw2_rate_limit_tokens", "Tokens available in the GW2 rate limiter", value=limiter._tokens)
+        yield CounterMetricFamily("gw2_rate_limit_throttled", "429 responses received from the GW2 API", value=limiter.throttled)
+
+        breakers = GaugeMetricFamily(
+            "gw2_circuit_breaker_open", "Whether the circuit breaker of an endpoint family is open", labels=["family"]
+        )
+        for family, stats in gw2_service.circuit_breakers.stats().items():
+            breakers.add_metric([family], 1 if stats["state"] == "open" else 0)
+        yield breakers
+
+        pool = async_engine.pool
+        yield GaugeMetricFamily("db_pool_size", "Configured size of the async database pool", value=pool.size())
+        yield GaugeMetricFamily("db_pool_checked_out", "Connections currently checked out", value=pool.checkedout())
+        yield GaugeMetricFamily("db_pool_overflow", "Connections open beyond the pool size", value=max(0, pool.overflow()))
+
+        yield CounterMetricFamily("auth_user_cache_hits", "Authenticated-user cache hits", value=user_cache.hits)
+        yield CounterMetricFamily("auth_user_cache_misses", "Authenticated-user cache misses", value=user_cache.misses)
+        yield GaugeMetricFamily("write_behind_pending", "Buffered bookkeeping updates", value=write_behind.pending)
+
+
+runtime_stats = RuntimeStatsCollector()
+if not multiprocess_enabled():
+    REGISTRY.register(runtime_stats)
+
+bearer = HTTPBearer(auto_error=False)
+
+
+def verify_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer)):
+    """Require METRICS_TOKEN as a bearer token; without one, /metrics is only served in development."""
+    if not settings.metrics_token:
+        if settings.environment != "development":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+        return
+    if credentials is None or not secrets.compare_digest(credentials.credentials, settings.metrics_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_token)])
+async def metrics():
+    """Prometheus metrics in text exposition format."""
+    registry = scrape_registry(runtime_stats)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -1,49 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from database.connection import get_db
-from app.schemas import User, UserCreate, UserUpdate
-from app.utils.auth import verify_token
+from database.connection import get_async_db
+from app.schemas import User, UserCreate, UserPage, UserUpdate
+from app.dependencies import get_current_user
 from services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
-security = HTTPBearer()
-
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user."""
-    token = credentials.credentials
-    email = verify_token(token)
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user_service = UserService(db)
-    user = user_service.get_user_by_email(email)
-    if user is None or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive"
-        )
-    
-    return user
 
 @router.post("/", response_model=User)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new user."""
     user_service = UserService(db)
     try:
-        user = user_service.create_user(user_data)
+        user = await user_service.create_user(user_data)
         return user
     except ValueError as e:
         raise HTTPException(
@@ -60,12 +34,12 @@ async def get_my_profile(current_user: User = Depends(get_current_user)):
 async def update_my_profile(
     user_data: UserUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's profile."""
     user_service = UserService(db)
     try:
-        updated_user = user_service.update_user(current_user.id, user_data)
+        updated_user = await user_service.update_user(current_user.id, user_data)
         return updated_user
     except ValueError as e:
         raise HTTPException(
@@ -76,11 +50,11 @@ async def update_my_profile(
 @router.delete("/me")
 async def deactivate_my_account(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deactivate current user's account."""
     user_service = UserService(db)
-    success = user_service.deactivate_user(current_user.id)
+    success = await user_service.deactivate_user(current_user.id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,14 +63,24 @@ async def deactivate_my_account(
     
     return {"message": "Account deactivated successfully"}
 
-@router.get("/", response_model=List[User])
+@router.get("/", response_model=UserPage)
 async def list_users(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    is_active: Optional[bool] = None,
+    is_verified: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all users (admin only - for now, all authenticated users)."""
+    """List users with cursor pagination (admin only - for now, all authenticated users)."""
     user_service = UserService(db)
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    try:
+        items, next_cursor = await user_service.list_users(
+            limit, cursor=cursor, is_active=is_active, is_verified=is_verified
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return UserPage(items=items, next_cursor=next_cursor)
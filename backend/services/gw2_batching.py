@@ -0,0 +1,115 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from services.gw2_errors import GW2NotFoundError
+
+
+class LoadResult(NamedTuple):
+    """Resultado de uma busca individual feita por um lote.
+    
+    O lote roda fora do contexto dos chamadores, então o estado que vira header da
+    resposta (entrada servida stale, id que falhou em um lote parcial) volta junto com
+    a entrada para que cada chamador o aplique na própria requisição.
+    """
+    entry: Optional[Dict[str, Any]]
+    stale: bool = False
+    error: Optional[Exception] = None
+
+
+class BatchLoader:
+    """Agrupa buscas de ids individuais feitas dentro de uma janela curta em uma única
+    requisição com ids=, no estilo DataLoader.
+    
+    fetch_many recebe a lista de ids pendentes e retorna as entradas encontradas
+    (dicionários com a chave "id"), opcionalmente com `stale_ids`, `failed_ids` e
+    `errors` (ver GW2BatchResult); cada chamador recebe apenas o seu LoadResult.
+    """
+    
+    def __init__(
+        self,
+        endpoint: str,
+        fetch_many: Callable[[List[Any]], Awaitable[List[Dict[str, Any]]]],
+        window: float,
+        max_batch_size: int,
+    ):
+        self.endpoint = endpoint
+        self.fetch_many = fetch_many
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Any, asyncio.Future] = {}
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: set = set()
+        self.loads = 0
+        self.batches = 0
+    
+    async def load(self, resource_id: Any) -> LoadResult:
+        """Agenda a busca de um id e aguarda o resultado do lote"""
+        loop = asyncio.get_running_loop()
+        self.loads += 1
+        future = self._pending.get(resource_id)
+        if future is None:
+            future = loop.create_future()
+            self._pending[resource_id] = future
+            # O despacho roda em um contexto vazio para não herdar o estado da
+            # requisição que abriu o lote (headers de resposta, prioridade, ...)
+            if len(self._pending) >= self.max_batch_size:
+                self._cancel_timer()
+                loop.call_soon(self._dispatch, context=contextvars.Context())
+            elif self._handle is None:
+                self._handle = loop.call_later(self.window, self._dispatch, context=contextvars.Context())
+        return await asyncio.shield(future)
+    
+    def _cancel_timer(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+    
+    def _dispatch(self):
+        self._cancel_timer()
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self.batches += 1
+        task = asyncio.ensure_future(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _resolve(self, batch: Dict[Any, asyncio.Future]):
+        try:
+            entries = await self.fetch_many(list(batch))
+        except GW2NotFoundError:
+            # Nenhum dos ids do lote existe
+            for resource_id, future in batch.items():
+                if not future.done():
+                    future.set_exception(GW2NotFoundError(self.endpoint, resource_id))
+                    future.exception()
+            return
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Evita o aviso de exceção não consumida se o chamador foi cancelado
+                    future.exception()
+            return
+        
+        found = {entry.get("id"): entry for entry in entries}
+        stale = set(getattr(entries, "stale_ids", ()))
+        failed = set(getattr(entries, "failed_ids", ()))
+        errors = getattr(entries, "errors", ())
+        for resource_id, future in batch.items():
+            if future.done():
+                continue
+            if resource_id in found:
+                future.set_result(LoadResult(found[resource_id], stale=resource_id in stale))
+            elif resource_id in failed and errors:
+                future.set_result(LoadResult(None, error=errors[0]))
+            else:
+                future.set_exception(GW2NotFoundError(self.endpoint, resource_id))
+                future.exception()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+from app.config import settings
+from services.gw2_rate_limiter import background_priority
+from services.gw2_service import GW2APIService, gw2_service
+
+logger = logging.getLogger(__name__)
+
+BuildListener = Callable[[Optional[int], int], Awaitable[None]]
+
+
+class BuildWatcher:
+    """Consulta periodicamente o endpoint /build e invalida os catálogos em cache
+    quando o jogo recebe uma nova build."""
+
+    def __init__(self, service: GW2APIService, interval: float):
+        self.service = service
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[BuildListener] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_listener(self, listener: BuildListener):
+        """Registra uma corrotina chamada com (build_anterior, build_nova) a cada troca de build"""
+        self._listeners.append(listener)
+
+    async def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def check(self) -> bool:
+        """Consulta a build atual; retorna True se ela mudou desde a última consulta"""
+        with background_priority():
+            # Consulta direta, sem passar pelo cache de respostas
+            payload = await self.service._fetch("build")
+        build_id = payload.data["id"]
+        previous = self.service.build_id
+        if previous == build_id:
+            return False
+
+        self.service.set_build(build_id)
+        if previous is None:
+            logger.info(f"Build atual do GW2: {build_id}")
+            return False
+
+        logger.info(f"Nova build do GW2 detectada: {previous} -> {build_id}; catálogos em cache invalidados")
+        for listener in self._listeners:
+            try:
+                await listener(previous, build_id)
+            except Exception as e:
+                logger.error(f"Erro ao notificar troca de build: {str(e)}")
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Erro ao consultar a build do GW2: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+
+# Instância global do monitor de build
+build_watcher = BuildWatcher(gw2_service, interval=settings.gw2_build_poll_interval)
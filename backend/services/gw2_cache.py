@@ -0,0 +1,337 @@
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from app.config import settings
+
+# Camadas de TTL: catálogos estáticos mudam apenas com uma nova build do jogo,
+# preços do Trading Post mudam em segundos e dados de conta são por chave de API
+CACHE_TIER_STATIC = "static"
+CACHE_TIER_DYNAMIC = "dynamic"
+CACHE_TIER_COMMERCE = "commerce"
+CACHE_TIER_ACCOUNT = "account"
+
+# Endpoints públicos cujo conteúdo muda independentemente da build
+DYNAMIC_ENDPOINT_PREFIXES = (
+    "build",
+    "achievements/daily",
+    "wvw/matches",
+    "guild/",
+)
+
+COMMERCE_ENDPOINT_PREFIXES = (
+    "commerce/prices",
+    "commerce/listings",
+    "commerce/exchange",
+)
+
+# Namespace das respostas "não encontrado" guardadas no cache negativo
+CACHE_NAMESPACE_NOT_FOUND = "not_found"
+
+NOT_FOUND_BODY = b'{"text":"no such id"}'
+
+MISS = object()
+
+
+def hash_api_key(api_key: str) -> str:
+    """Retorna um identificador curto e não reversível da chave de API"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_tier(endpoint: str, api_key: Optional[str] = None) -> str:
+    """Classifica um endpoint em uma camada de TTL"""
+    if api_key:
+        return CACHE_TIER_ACCOUNT
+    if endpoint.startswith(COMMERCE_ENDPOINT_PREFIXES):
+        return CACHE_TIER_COMMERCE
+    if endpoint.startswith(DYNAMIC_ENDPOINT_PREFIXES):
+        return CACHE_TIER_DYNAMIC
+    return CACHE_TIER_STATIC
+
+
+def tier_ttl(tier: str, build_scoped: bool = False) -> float:
+    """Retorna o TTL configurado (em segundos) para uma camada.
+    
+    Quando a build do jogo é monitorada, os catálogos estáticos ficam vinculados
+    à build atual e podem usar um TTL bem mais longo.
+    """
+    if tier == CACHE_TIER_STATIC and build_scoped:
+        return settings.gw2_cache_ttl_build_scoped
+    return {
+        CACHE_TIER_STATIC: settings.gw2_cache_ttl_static,
+        CACHE_TIER_DYNAMIC: settings.gw2_cache_ttl_dynamic,
+        CACHE_TIER_COMMERCE: settings.gw2_cache_ttl_commerce,
+        CACHE_TIER_ACCOUNT: settings.gw2_cache_ttl_account,
+    }[tier]
+
+
+# Headers da API do GW2 repassados ao cliente no modo passthrough
+PASSTHROUGH_HEADERS = (
+    "cache-control",
+    "link",
+    "x-page-size",
+    "x-page-total",
+    "x-result-count",
+    "x-result-total",
+)
+
+
+class GW2Payload:
+    """Corpo de uma resposta da API do GW2 guardado exatamente como recebido.
+    
+    O JSON é decodificado a cada acesso a `data`, em um objeto novo para cada chamador;
+    nada decodificado fica preso ao payload, então o cache ocupa o que contabiliza (os
+    bytes do corpo). O modo passthrough repassa os bytes sem decodificar.
+    """
+    __slots__ = ("body", "status_code", "content_type", "headers")
+    
+    def __init__(
+        self,
+        body: bytes,
+        status_code: int = 200,
+        content_type: str = "application/json; charset=utf-8",
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.body = body
+        self.status_code = status_code
+        self.content_type = content_type
+        self.headers = headers or {}
+    
+    @classmethod
+    def from_data(cls, data: Any) -> "GW2Payload":
+        """Cria um payload a partir de um valor já decodificado (ex.: entrada de um lote)"""
+        return cls(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    
+    @property
+    def data(self) -> Any:
+        return json.loads(self.body)
+    
+    @property
+    def size(self) -> int:
+        return len(self.body)
+    
+    @property
+    def not_found(self) -> bool:
+        """Indica uma resposta 404 guardada no cache negativo"""
+        return self.status_code == 404
+
+
+def cache_key(
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    api_key: Optional[str] = None,
+    build: Optional[int] = None,
+) -> str:
+    """Monta a chave canônica de cache para um endpoint e seus parâmetros"""
+    key = endpoint
+    if params:
+        key += "?" + "&".join(f"{name}={params[name]}" for name in sorted(params))
+    if build is not None:
+        key = f"b{build}:{key}"
+    if api_key:
+        # Nunca guardamos a chave de API em texto puro nas chaves do cache
+        key = f"acct:{hash_api_key(api_key)}:{key}"
+    return key
+
+
+def key_endpoint(key: str) -> str:
+    """Extrai o endpoint de uma chave de cache, sem o prefixo de conta, a build e os parâmetros"""
+    if key.startswith("acct:"):
+        key = key.split(":", 2)[2]
+    build, separator, rest = key.partition(":")
+    if separator and build[:1] == "b" and build[1:].isdigit():
+        key = rest
+    return key.split("?", 1)[0]
+
+
+class CacheEntry:
+    __slots__ = ("value", "expires_at", "stale_until", "size", "namespace")
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float, size: int, namespace: str):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+        self.namespace = namespace
+
+
+class ResponseCache:
+    """Cache LRU em memória com TTL por entrada e limite de memória aproximado.
+
+    Os valores são GW2Payload com os bytes originais da resposta; o tamanho contabilizado
+    é o do corpo, já que o JSON decodificado não fica guardado nas entradas. Entradas expiradas
+    continuam disponíveis via get_stale() durante a janela de stale_ttl, para serem
+    servidas quando a API upstream estiver lenta ou fora do ar. Os valores são
+    compartilhados entre os chamadores e não devem ser modificados.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, stale_ttl: float = 0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """Retorna o valor armazenado ou MISS se ausente ou expirado"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS
+        now = time.monotonic()
+        if entry.expires_at <= now:
+            if entry.stale_until <= now:
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def get_stale(self, key: str) -> Any:
+        """Retorna o último valor conhecido, mesmo expirado, ou MISS se fora da janela de stale"""
+        entry = self._entries.get(key)
+        if entry is None or entry.stale_until <= time.monotonic():
+            return MISS
+        return entry.value
+
+    def record_stale_hit(self):
+        self.stale_hits += 1
+
+    def set(self, key: str, value: Any, ttl: float, size: int, namespace: str, stale_ttl: Optional[float] = None):
+        """Armazena um valor, removendo as entradas menos usadas se necessário"""
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        self._insert(key, CacheEntry(value, expires_at, expires_at + stale_ttl, size, namespace))
+    
+    def _insert(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+    
+    def entries(self) -> List[Tuple[str, CacheEntry]]:
+        """Cópia das entradas atuais (chave, entrada), da menos para a mais usada"""
+        return list(self._entries.items())
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Exporta as entradas ainda dentro da janela de stale, da menos para a mais usada.
+        
+        Os horários são convertidos para tempo de parede para valerem após um restart;
+        respostas de conta (chaves acct:) nunca são exportadas.
+        """
+        now = time.monotonic()
+        wall = time.time()
+        records = []
+        for key, entry in self._entries.items():
+            if entry.stale_until <= now or key.startswith("acct:"):
+                continue
+            payload = entry.value
+            records.append({
+                "key": key,
+                "namespace": entry.namespace,
+                "body": base64.b64encode(payload.body).decode("ascii"),
+                "status_code": payload.status_code,
+                "content_type": payload.content_type,
+                "headers": payload.headers,
+                "expires_at": wall + (entry.expires_at - now),
+                "stale_until": wall + (entry.stale_until - now),
+            })
+        return records
+    
+    def restore(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Carrega entradas exportadas por snapshot(); retorna quantas foram restauradas"""
+        now = time.monotonic()
+        wall = time.time()
+        restored = 0
+        for record in records:
+            if record["stale_until"] <= wall or record["key"] in self._entries:
+                continue
+            payload = GW2Payload(
+                base64.b64decode(record["body"]),
+                status_code=record["status_code"],
+                content_type=record["content_type"],
+                headers=record["headers"],
+            )
+            if payload.size > self.max_bytes:
+                continue
+            self._insert(record["key"], CacheEntry(
+                payload,
+                now + (record["expires_at"] - wall),
+                now + (record["stale_until"] - wall),
+                payload.size,
+                record["namespace"],
+            ))
+            restored += 1
+        return restored
+
+    def invalidate(
+        self,
+        namespace: Optional[str] = None,
+        prefix: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> int:
+        """Remove entradas por camada, prefixo de endpoint e/ou chave de API.
+
+        Sem filtros, esvazia o cache inteiro. Retorna o número de entradas removidas.
+        """
+        if api_key:
+            prefix = f"acct:{hash_api_key(api_key)}:{prefix or ''}"
+        keys = [
+            key for key, entry in self._entries.items()
+            if (namespace is None or entry.namespace == namespace)
+            and (prefix is None or key.startswith(prefix))
+        ]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> int:
+        """Esvazia o cache"""
+        return self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna métricas de uso do cache"""
+        namespaces: Dict[str, Dict[str, int]] = {}
+        for entry in self._entries.values():
+            namespace = namespaces.setdefault(entry.namespace, {"entries": 0, "bytes": 0})
+            namespace["entries"] += 1
+            namespace["bytes"] += entry.size
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "namespaces": namespaces,
+        }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
@@ -0,0 +1,350 @@
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection, Engine
+from app.config import settings
+from database.connection import SessionLocal, engine as default_engine
+from models.gw2_models import GW2CatalogEntry
+from services.gw2_rate_limiter import background_priority
+from services.gw2_service import GW2APIService, MAX_IDS_PER_REQUEST, gw2_service
+
+logger = logging.getLogger(__name__)
+
+# Catálogos grandes espelhados no Postgres
+MIRRORED_CATALOGS = ("items", "skins", "recipes", "achievements")
+
+UPSERT_BATCH_SIZE = 1000
+
+# Prefixo do advisory lock que garante um único worker sincronizando cada catálogo
+SYNC_LOCK_PREFIX = "gw2_catalog_sync:"
+
+# Intervalo para conferir se outro worker terminou a sincronização da nova build
+PEER_SYNC_POLL_INTERVAL = 15.0
+
+SyncListener = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+def content_hash(entry: Dict[str, Any]) -> str:
+    """Hash estável do conteúdo de uma entrada, usado para detectar mudanças"""
+    encoded = json.dumps(entry, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class GW2CatalogMirror:
+    """Espelho local dos catálogos do GW2 no Postgres com sincronização incremental.
+
+    A primeira sincronização de um catálogo busca todas as páginas em paralelo;
+    as seguintes comparam a lista de ids e buscam apenas os ids novos. Quando a
+    build do espelho difere da build atual, a sincronização é completa, regrava só
+    as entradas cujo conteúdo mudou e marca todas com a nova build; até lá o espelho
+    não é usado (ver is_current). Um advisory lock por catálogo faz com que apenas um
+    worker sincronize; os demais aguardam e recarregam o estado do banco.
+    """
+
+    def __init__(self, service: GW2APIService, session_factory=SessionLocal, engine: Engine = default_engine):
+        self.service = service
+        self.session_factory = session_factory
+        self.engine = engine
+        self.ready: Set[str] = set()
+        # Build com que cada catálogo foi sincronizado por completo pela última vez
+        self.builds: Dict[str, Optional[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._build_sync_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(settings.gw2_catalog_sync_concurrency)
+        self.last_results: Dict[str, Dict[str, Any]] = {}
+        self._listeners: List[SyncListener] = []
+
+    def add_listener(self, listener: SyncListener):
+        """Registra uma corrotina chamada com (catálogo, resumo) após cada sincronização"""
+        self._listeners.append(listener)
+
+    # Leitura
+    async def load_state(self):
+        """Marca como prontos os catálogos que já possuem dados no banco e registra suas builds"""
+        state = await asyncio.to_thread(self._catalog_state)
+        self.ready = {resource for resource, (count, _) in state.items() if count > 0}
+        self.builds = {resource: build for resource, (_, build) in state.items()}
+
+    def is_current(self, resource: str) -> bool:
+        """Indica se o catálogo está espelhado e sincronizado com a build atual do jogo"""
+        build = self.service.build_id
+        if build is None:
+            # Sem a build ainda não dá para saber se o espelho está desatualizado
+            return resource in self.ready and not settings.gw2_build_watch_enabled
+        return resource in self.ready and self.builds.get(resource) == build
+
+    async def get_many(self, resource: str, ids: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Retorna as entradas espelhadas para os ids informados, indexadas por id"""
+        return await asyncio.to_thread(self._select_entries, resource, ids)
+
+    def _catalog_state(self, resource: Optional[str] = None) -> Dict[str, Tuple[int, Optional[int]]]:
+        # A menor build entre as entradas: só é a atual depois de uma sincronização completa
+        query = select(GW2CatalogEntry.resource, func.count(), func.min(GW2CatalogEntry.build_id))
+        if resource is not None:
+            query = query.where(GW2CatalogEntry.resource == resource)
+        with self.session_factory() as db:
+            rows = db.execute(query.group_by(GW2CatalogEntry.resource)).all()
+        return {resource: (count, build) for resource, count, build in rows}
+
+    def _select_entries(self, resource: str, ids: List[Any]) -> Dict[Any, Dict[str, Any]]:
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(GW2CatalogEntry.entry_id, GW2CatalogEntry.data)
+                .where(GW2CatalogEntry.resource == resource, GW2CatalogEntry.entry_id.in_(ids))
+            ).all()
+        return {entry_id: data for entry_id, data in rows}
+
+    def _local_hashes(self, resource: str) -> Dict[int, str]:
+        with self.session_factory() as db:
+            rows = db.execute(
+                select(GW2CatalogEntry.entry_id, GW2CatalogEntry.content_hash)
+                .where(GW2CatalogEntry.resource == resource)
+            ).all()
+        return {entry_id: digest for entry_id, digest in rows}
+
+    # Escrita
+    def _upsert(self, resource: str, entries: List[Tuple[Dict[str, Any], str]]):
+        with self.session_factory() as db:
+            for start in range(0, len(entries), UPSERT_BATCH_SIZE):
+                batch = entries[start:start + UPSERT_BATCH_SIZE]
+                statement = insert(GW2CatalogEntry)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[GW2CatalogEntry.resource, GW2CatalogEntry.entry_id],
+                    set_={
+                        "data": statement.excluded.data,
+                        "content_hash": statement.excluded.content_hash,
+                        "build_id": statement.excluded.build_id,
+                        "synced_at": func.now(),
+                    },
+                )
+                # Uma lista de parâmetros faz o SQLAlchemy usar executemany em lote
+                db.execute(statement, [
+                    {
+                        "resource": resource,
+                        "entry_id": entry["id"],
+                        "data": entry,
+                        "content_hash": digest,
+                        "build_id": self.service.build_id,
+                    }
+                    for entry, digest in batch
+                ])
+            db.commit()
+
+    def _stamp_build(self, resource: str, build_id: int):
+        """Marca todas as entradas do catálogo com a build sincronizada, inclusive as que não mudaram"""
+        with self.session_factory() as db:
+            db.execute(
+                update(GW2CatalogEntry)
+                .where(GW2CatalogEntry.resource == resource)
+                .where(or_(GW2CatalogEntry.build_id.is_(None), GW2CatalogEntry.build_id != build_id))
+                .values(build_id=build_id)
+            )
+            db.commit()
+
+    def _delete(self, resource: str, ids: Iterable[int]):
+        ids = list(ids)
+        with self.session_factory() as db:
+            for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+                db.execute(
+                    delete(GW2CatalogEntry)
+                    .where(GW2CatalogEntry.resource == resource)
+                    .where(GW2CatalogEntry.entry_id.in_(ids[start:start + UPSERT_BATCH_SIZE]))
+                )
+            db.commit()
+
+    # Advisory lock
+    def _acquire_sync_lock(self, resource: str) -> Optional[Connection]:
+        """Tenta obter o lock do catálogo; retorna a conexão que o mantém ou None se outro worker o detém"""
+        connection = self.engine.connect()
+        try:
+            acquired = True
+            if connection.dialect.name == "postgresql":
+                acquired = connection.execute(
+                    select(func.pg_try_advisory_lock(func.hashtext(SYNC_LOCK_PREFIX + resource)))
+                ).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return None
+        return connection
+
+    def _release_sync_lock(self, connection: Connection, resource: str):
+        try:
+            if connection.dialect.name == "postgresql":
+                connection.execute(select(func.pg_advisory_unlock(func.hashtext(SYNC_LOCK_PREFIX + resource))))
+                connection.commit()
+        except Exception as e:
+            # Descarta a conexão para que o lock não fique preso em uma conexão do pool
+            logger.warning(f"Erro ao liberar o lock de sincronização de {resource}: {str(e)}")
+            connection.invalidate()
+        finally:
+            connection.close()
+
+    # Busca upstream
+    async def _fetch_page(self, resource: str, page: int) -> List[Dict[str, Any]]:
+        async with self._semaphore:
+            payload = await self.service._fetch(resource, params={"page": page, "page_size": MAX_IDS_PER_REQUEST})
+            return payload.data
+
+    async def _fetch_ids(self, resource: str, ids: List[int]) -> List[Dict[str, Any]]:
+        async def fetch_chunk(chunk: List[int]) -> List[Dict[str, Any]]:
+            async with self._semaphore:
+                payload = await self.service._fetch(resource, params={"ids": ",".join(map(str, chunk))})
+                return payload.data
+
+        chunks = [ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+        return [entry for result in results for entry in result]
+
+    async def sync(self, resource: str, full: bool = False) -> Dict[str, Any]:
+        """Sincroniza um catálogo com a API do GW2 e retorna um resumo da operação.
+
+        Se outro worker já está sincronizando o catálogo, retorna sem fazer nada com
+        `skipped` no resumo.
+        """
+        lock = await asyncio.to_thread(self._acquire_sync_lock, resource)
+        if lock is None:
+            logger.info(f"Catálogo {resource} já está sendo sincronizado por outro worker")
+            return {"resource": resource, "skipped": True}
+        try:
+            return await self._sync_locked(resource, full)
+        finally:
+            await asyncio.to_thread(self._release_sync_lock, lock, resource)
+
+    async def _sync_locked(self, resource: str, full: bool) -> Dict[str, Any]:
+        build = self.service.build_id
+        was_current = self.is_current(resource)
+        # Outro worker pode ter concluído a sincronização da build atual enquanto este aguardava
+        _, stored_build = (await asyncio.to_thread(self._catalog_state, resource)).get(resource, (0, None))
+        with background_priority():
+            upstream_ids = (await self.service._fetch(resource)).data
+            local = await asyncio.to_thread(self._local_hashes, resource)
+            upstream = set(upstream_ids)
+            full = full or not local or (build is not None and stored_build != build)
+
+            if full:
+                pages = math.ceil(len(upstream_ids) / MAX_IDS_PER_REQUEST)
+                results = await asyncio.gather(*(self._fetch_page(resource, page) for page in range(pages)))
+                fetched = [entry for result in results for entry in result]
+            else:
+                fetched = await self._fetch_ids(resource, sorted(upstream - set(local)))
+
+        hashed = [(entry, content_hash(entry)) for entry in fetched]
+        changed = [(entry, digest) for entry, digest in hashed if local.get(entry["id"]) != digest]
+        removed = set(local) - upstream
+        if changed:
+            await asyncio.to_thread(self._upsert, resource, changed)
+        if removed:
+            await asyncio.to_thread(self._delete, resource, removed)
+        if full:
+            if build is not None:
+                await asyncio.to_thread(self._stamp_build, resource, build)
+            stored_build = build
+
+        self.ready.add(resource)
+        self.builds[resource] = stored_build
+        if not was_current and self.is_current(resource) and build is not None:
+            # Entradas servidas do espelho desatualizado podem ter ido para o cache com a chave da nova build
+            self.service.invalidate_cache(endpoint=f"{resource}/")
+        result = {
+            "resource": resource,
+            "full": full,
+            "upstream": len(upstream),
+            "fetched": len(fetched),
+            "written": len(changed),
+            "removed": len(removed),
+        }
+        self.last_results[resource] = result
+        logger.info(f"Catálogo {resource} sincronizado: {result}")
+        for listener in self._listeners:
+            try:
+                await listener(resource, result)
+            except Exception as e:
+                logger.error(f"Erro ao notificar sincronização do catálogo {resource}: {str(e)}")
+        return result
+
+    async def sync_all(self, full: bool = False, resources: Iterable[str] = MIRRORED_CATALOGS) -> List[Dict[str, Any]]:
+        """Sincroniza os catálogos espelhados, um de cada vez"""
+        async with self._lock:
+            results = []
+            for resource in resources:
+                try:
+                    results.append(await self.sync(resource, full=full))
+                except Exception as e:
+                    logger.error(f"Erro ao sincronizar catálogo {resource}: {str(e)}")
+            return results
+
+    async def on_build_changed(self, previous: Optional[int], build_id: int):
+        """Agenda a sincronização dos catálogos após uma nova build do jogo"""
+        if self._build_sync_task is not None:
+            self._build_sync_task.cancel()
+        self._build_sync_task = asyncio.create_task(self._sync_after_build())
+
+    async def _sync_after_build(self):
+        """Sincroniza os catálogos com a nova build (completa, pois a build do espelho difere).
+
+        Catálogos que outro worker está sincronizando são tentados de novo até que o lock
+        fique livre; a essa altura o espelho já está na build atual e a tentativa só
+        atualiza o estado deste worker.
+        """
+        pending = list(MIRRORED_CATALOGS)
+        while pending:
+            results = await self.sync_all(resources=pending)
+            pending = [result["resource"] for result in results if result.get("skipped")]
+            if pending:
+                await asyncio.sleep(PEER_SYNC_POLL_INTERVAL)
+
+    # Ciclo de vida
+    async def start(self):
+        await self.load_state()
+        self.service.catalog_mirror = self
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self.service.catalog_mirror = None
+        # A sincronização completa agendada por uma nova build também precisa parar antes
+        # de o cliente HTTP e o engine do banco serem fechados
+        for task in (self._task, self._build_sync_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._build_sync_task = None
+
+    async def _wait_for_build(self):
+        """Aguarda a primeira consulta do build watcher para saber se o espelho está desatualizado"""
+        deadline = time.monotonic() + 2 * settings.gw2_build_poll_interval
+        while self.service.build_id is None and time.monotonic() < deadline:
+            await asyncio.sleep(1.0)
+
+    async def _run(self):
+        if settings.gw2_build_watch_enabled:
+            await self._wait_for_build()
+        while True:
+            await self.sync_all()
+            await asyncio.sleep(settings.gw2_catalog_sync_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": sorted(self.ready),
+            "current": sorted(resource for resource in self.ready if self.is_current(resource)),
+            "builds": self.builds,
+            "last_results": self.last_results,
+        }
+
+
+# Instância global do espelho de catálogos
+catalog_mirror = GW2CatalogMirror(gw2_service)
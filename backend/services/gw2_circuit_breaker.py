@@ -0,0 +1,90 @@
+import time
+from typing import Any, Dict
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Agrupa endpoints pelo primeiro segmento do caminho (items, commerce, account, ...)"""
+    return endpoint.split("/", 1)[0].split("?", 1)[0]
+
+
+class CircuitBreaker:
+    """Circuit breaker clássico: abre após falhas consecutivas, libera uma requisição
+    de teste depois do tempo de espera e fecha novamente se ela tiver sucesso."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Indica se uma requisição pode ser enviada agora"""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and self.retry_in() <= 0:
+            self.state = STATE_HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == STATE_HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def abort_trial(self):
+        """Libera a requisição de teste quando ela é cancelada antes de terminar"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != STATE_OPEN:
+                self.times_opened += 1
+            self.state = STATE_OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 3) if self.state == STATE_OPEN else 0.0,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Mantém um circuit breaker por família de endpoints"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        family = endpoint_family(endpoint)
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = CircuitBreaker(family, self.failure_threshold, self.reset_timeout)
+            self._breakers[family] = breaker
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        return {family: breaker.stats() for family, breaker in self._breakers.items()}
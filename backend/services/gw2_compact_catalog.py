@@ -0,0 +1,448 @@
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from app.config import settings
+from database.connection import SessionLocal
+from models.gw2_models import GW2CatalogEntry
+from services.gw2_rate_limiter import background_priority
+from services.gw2_service import GW2APIService, MAX_IDS_PER_REQUEST, gw2_service
+
+logger = logging.getLogger(__name__)
+
+# Campos guardados em colunas por catálogo: strings repetidas (enums), inteiros e listas de flags
+CATALOG_LAYOUTS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "items": {
+        "enums": ("type", "rarity"),
+        "integers": ("level", "vendor_value", "default_skin"),
+        "bitmasks": ("flags", "game_types"),
+    },
+    "skins": {
+        "enums": ("type", "rarity"),
+        "integers": (),
+        "bitmasks": ("flags",),
+    },
+}
+
+MAX_BITMASK_VALUES = 64
+MAX_ENUM_VALUES = 65535
+
+# Dicionário compartilhado do zlib, montado com entradas de amostra de cada catálogo
+ZDICT_SAMPLE_ENTRIES = 200
+ZDICT_MAX_BYTES = 32 * 1024
+
+LOAD_BATCH_SIZE = 1000
+
+
+def _array_bytes(column: array) -> int:
+    return column.buffer_info()[1] * column.itemsize
+
+
+class CompactCatalog:
+    """Catálogo de itens ou skins em formato colunar, com uma fração da memória dos dicts.
+
+    Os campos mais usados ficam em colunas `array`: ids (ordenados, usados como índice
+    com busca binária), enums como type e rarity (códigos para strings internadas),
+    inteiros como level e vendor_value e listas de flags como bitmask. Os nomes são
+    strings internadas. O restante da entrada (details, description, icon, ...) é
+    guardado como JSON comprimido com zlib, usando um dicionário compartilhado, em um
+    único buffer, e só é decodificado quando a entrada é pedida.
+
+    Valores que não cabem nas colunas (tipo inesperado, mais de 64 flags distintas,
+    flags fora da ordem do vocabulário) ficam no JSON comprimido, de modo que get()
+    sempre devolve o mesmo conteúdo recebido da API. Depois de finalize() o catálogo
+    é somente leitura e pode ser lido de qualquer thread.
+    """
+
+    def __init__(
+        self,
+        resource: str,
+        enums: Tuple[str, ...] = (),
+        integers: Tuple[str, ...] = (),
+        bitmasks: Tuple[str, ...] = (),
+        zdict: bytes = b"",
+    ):
+        self.resource = resource
+        self.enums = enums
+        self.integers = integers
+        self.bitmasks = bitmasks
+        self.zdict = zdict
+        self.ids = array("q")
+        # Um bit de presença por campo em coluna, na ordem: name, enums, inteiros, bitmasks
+        self._present = array("L")
+        self._names: List[Optional[str]] = []
+        self._enum_columns = {field: array("H") for field in enums}
+        self._enum_values: Dict[str, List[Optional[str]]] = {field: [None] for field in enums}
+        self._enum_codes: Dict[str, Dict[str, int]] = {field: {} for field in enums}
+        self._integer_columns = {field: array("q") for field in integers}
+        self._bitmask_columns = {field: array("Q") for field in bitmasks}
+        self._bitmask_values: Dict[str, List[str]] = {field: [] for field in bitmasks}
+        self._bitmask_bits: Dict[str, Dict[str, int]] = {field: {} for field in bitmasks}
+        self._blob = bytearray()
+        self._offsets = array("Q", [0])
+        self._sorted = True
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, entry_id: Any) -> bool:
+        return self._row(entry_id) is not None
+
+    # Construção
+    @staticmethod
+    def build_zdict(samples: Sequence[Dict[str, Any]], layout: Dict[str, Tuple[str, ...]]) -> bytes:
+        """Monta o dicionário do zlib a partir da parte comprimida de entradas de amostra"""
+        columns = {"id", "name", *layout["enums"], *layout["integers"], *layout["bitmasks"]}
+        step = max(1, len(samples) // ZDICT_SAMPLE_ENTRIES)
+        parts = [
+            json.dumps({key: value for key, value in entry.items() if key not in columns},
+                       separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            for entry in samples[::step]
+        ]
+        # O zlib aproveita melhor o final do dicionário; o excedente do início é descartado
+        return b"".join(parts)[-ZDICT_MAX_BYTES:]
+
+    def _enum_code(self, field: str, value: str) -> Optional[int]:
+        codes = self._enum_codes[field]
+        code = codes.get(value)
+        if code is None:
+            values = self._enum_values[field]
+            if len(values) > MAX_ENUM_VALUES:
+                return None
+            code = codes[value] = len(values)
+            values.append(sys.intern(value))
+        return code
+
+    def _bitmask(self, field: str, values: Any) -> Optional[int]:
+        if not isinstance(values, list):
+            return None
+        bits = self._bitmask_bits[field]
+        vocabulary = self._bitmask_values[field]
+        mask = 0
+        previous = -1
+        for value in values:
+            if not isinstance(value, str):
+                return None
+            bit = bits.get(value)
+            if bit is None:
+                if len(vocabulary) >= MAX_BITMASK_VALUES:
+                    return None
+                bit = bits[value] = len(vocabulary)
+                vocabulary.append(sys.intern(value))
+            # A decodificação percorre os bits em ordem; outra ordem (ou repetição) não é representável
+            if bit <= previous:
+                return None
+            previous = bit
+            mask |= 1 << bit
+        return mask
+
+    def _compress(self, rest: Dict[str, Any]) -> bytes:
+        if not rest:
+            return b""
+        encoded = json.dumps(rest, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        compressor = zlib.compressobj(9, zdict=self.zdict) if self.zdict else zlib.compressobj(9)
+        return compressor.compress(encoded) + compressor.flush()
+
+    def add(self, entry: Dict[str, Any]):
+        entry_id = entry.get("id")
+        if type(entry_id) is not int:
+            self.skipped += 1
+            return
+        rest = dict(entry)
+        del rest["id"]
+        present = 0
+        bit = 1
+
+        name = rest.get("name")
+        if isinstance(name, str):
+            self._names.append(sys.intern(name))
+            del rest["name"]
+            present |= bit
+        else:
+            self._names.append(None)
+        bit <<= 1
+
+        for field in self.enums:
+            value = rest.get(field)
+            code = self._enum_code(field, value) if isinstance(value, str) else None
+            if code is None:
+                self._enum_columns[field].append(0)
+            else:
+                self._enum_columns[field].append(code)
+                del rest[field]
+                present |= bit
+            bit <<= 1
+
+        for field in self.integers:
+            value = rest.get(field)
+            if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+                self._integer_columns[field].append(value)
+                del rest[field]
+                present |= bit
+            else:
+                self._integer_columns[field].append(0)
+            bit <<= 1
+
+        for field in self.bitmasks:
+            mask = self._bitmask(field, rest[field]) if field in rest else None
+            if mask is None:
+                self._bitmask_columns[field].append(0)
+            else:
+                self._bitmask_columns[field].append(mask)
+                del rest[field]
+                present |= bit
+            bit <<= 1
+
+        self._blob += self._compress(rest)
+        self._offsets.append(len(self._blob))
+        self._present.append(present)
+        if self.ids and entry_id <= self.ids[-1]:
+            self._sorted = False
+        self.ids.append(entry_id)
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]):
+        for entry in entries:
+            self.add(entry)
+
+    def finalize(self):
+        """Ordena as linhas por id (se necessário) e compacta o buffer do JSON comprimido"""
+        if not self._sorted:
+            order = sorted(range(len(self.ids)), key=self.ids.__getitem__)
+            self.ids = array("q", (self.ids[row] for row in order))
+            self._present = array("L", (self._present[row] for row in order))
+            self._names = [self._names[row] for row in order]
+            for columns in (self._enum_columns, self._integer_columns, self._bitmask_columns):
+                for field, column in columns.items():
+                    columns[field] = array(column.typecode, (column[row] for row in order))
+            blob = bytearray()
+            offsets = array("Q", [0])
+            for row in order:
+                blob += self._blob[self._offsets[row]:self._offsets[row + 1]]
+                offsets.append(len(blob))
+            self._blob, self._offsets = blob, offsets
+            self._sorted = True
+        self._blob = bytes(self._blob)
+
+    # Leitura
+    def _row(self, entry_id: Any) -> Optional[int]:
+        if type(entry_id) is not int:
+            return None
+        row = bisect_left(self.ids, entry_id)
+        if row < len(self.ids) and self.ids[row] == entry_id:
+            return row
+        return None
+
+    def _decode(self, row: int) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"id": self.ids[row]}
+        present = self._present[row]
+        bit = 1
+        if present & bit:
+            entry["name"] = self._names[row]
+        bit <<= 1
+        for field in self.enums:
+            if present & bit:
+                entry[field] = self._enum_values[field][self._enum_columns[field][row]]
+            bit <<= 1
+        for field in self.integers:
+            if present & bit:
+                entry[field] = self._integer_columns[field][row]
+            bit <<= 1
+        for field in self.bitmasks:
+            if present & bit:
+                mask = self._bitmask_columns[field][row]
+                entry[field] = [value for index, value in enumerate(self._bitmask_values[field]) if mask >> index & 1]
+            bit <<= 1
+        start, end = self._offsets[row], self._offsets[row + 1]
+        if end > start:
+            decompressor = zlib.decompressobj(zdict=self.zdict) if self.zdict else zlib.decompressobj()
+            entry.update(json.loads(decompressor.decompress(self._blob[start:end]) + decompressor.flush()))
+        return entry
+
+    def get(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada completa (um dict novo a cada chamada) ou None se o id não existe"""
+        row = self._row(entry_id)
+        return None if row is None else self._decode(row)
+
+    def get_many(self, ids: Iterable[Any]) -> Dict[Any, Dict[str, Any]]:
+        """Retorna as entradas encontradas, indexadas por id"""
+        found = {}
+        for entry_id in ids:
+            row = self._row(entry_id)
+            if row is not None:
+                found[entry_id] = self._decode(row)
+        return found
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Memória aproximada ocupada pelas colunas, nomes, JSON comprimido e vocabulários"""
+        columns = [self.ids, self._present, self._offsets,
+                   *self._enum_columns.values(), *self._integer_columns.values(), *self._bitmask_columns.values()]
+        columns_bytes = sum(_array_bytes(column) for column in columns)
+        unique_names = {id(name): name for name in self._names if name is not None}
+        names_bytes = sys.getsizeof(self._names) + sum(sys.getsizeof(name) for name in unique_names.values())
+        vocabulary_bytes = sum(
+            sys.getsizeof(value)
+            for values in (*self._enum_values.values(), *self._bitmask_values.values())
+            for value in values if value is not None
+        )
+        details_bytes = len(self._blob) + len(self.zdict)
+        return {
+            "entries": len(self),
+            "columns_bytes": columns_bytes,
+            "names_bytes": names_bytes,
+            "vocabulary_bytes": vocabulary_bytes,
+            "compressed_bytes": details_bytes,
+            "approx_bytes": columns_bytes + names_bytes + vocabulary_bytes + details_bytes,
+        }
+
+
+class CompactCatalogStore:
+    """Carrega os catálogos compactos e os publica em `service.compact_catalogs`.
+
+    Os dados vêm do espelho no Postgres quando ele está na build atual para o catálogo e,
+    caso contrário, das páginas da API do GW2 (com prioridade de segundo plano). Uma
+    nova build descarta os catálogos carregados; eles são recarregados em seguida ou,
+    com o espelho ativo, depois que ele terminar de sincronizar cada catálogo.
+    """
+
+    def __init__(self, service: GW2APIService, session_factory=SessionLocal):
+        self.service = service
+        self.session_factory = session_factory
+        self.last_loads: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._semaphore = asyncio.Semaphore(settings.gw2_catalog_sync_concurrency)
+
+    @staticmethod
+    def _new_catalog(resource: str, samples: Sequence[Dict[str, Any]]) -> CompactCatalog:
+        layout = CATALOG_LAYOUTS[resource]
+        return CompactCatalog(resource, zdict=CompactCatalog.build_zdict(samples, layout), **layout)
+
+    def _load_from_mirror(self, resource: str) -> CompactCatalog:
+        catalog = None
+        with self.session_factory() as db:
+            result = db.execute(
+                select(GW2CatalogEntry.data)
+                .where(GW2CatalogEntry.resource == resource)
+                .order_by(GW2CatalogEntry.entry_id)
+                .execution_options(yield_per=LOAD_BATCH_SIZE)
+            )
+            for partition in result.partitions():
+                entries = [data for data, in partition]
+                if catalog is None:
+                    catalog = self._new_catalog(resource, entries)
+                catalog.add_many(entries)
+        catalog = catalog or self._new_catalog(resource, [])
+        catalog.finalize()
+        return catalog
+
+    async def _load_from_upstream(self, resource: str) -> CompactCatalog:
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            async with self._semaphore:
+                payload = await self.service._fetch(resource, params={"page": page, "page_size": MAX_IDS_PER_REQUEST})
+                return payload.data
+
+        catalog = None
+        with background_priority():
+            ids = (await self.service._fetch(resource)).data
+            pages = [asyncio.create_task(fetch_page(page)) for page in range(math.ceil(len(ids) / MAX_IDS_PER_REQUEST))]
+            try:
+                # Cada página é adicionada assim que chega; o catálogo nunca tem todos os dicts ao mesmo tempo
+                for page in asyncio.as_completed(pages):
+                    entries = await page
+                    if catalog is None:
+                        catalog = self._new_catalog(resource, entries)
+                    await asyncio.to_thread(catalog.add_many, entries)
+            finally:
+                for page in pages:
+                    page.cancel()
+        catalog = catalog or self._new_catalog(resource, [])
+        await asyncio.to_thread(catalog.finalize)
+        return catalog
+
+    async def load(self, resource: str) -> CompactCatalog:
+        """Monta o catálogo compacto de um recurso e passa a servi-lo"""
+        started = time.monotonic()
+        mirror = self.service.catalog_mirror
+        if mirror is not None and mirror.is_current(resource):
+            source = "mirror"
+            catalog = await asyncio.to_thread(self._load_from_mirror, resource)
+        else:
+            source = "upstream"
+            catalog = await self._load_from_upstream(resource)
+        self.service.compact_catalogs[resource] = catalog
+        self.last_loads[resource] = {
+            "source": source,
+            "build": self.service.build_id,
+            "seconds": round(time.monotonic() - started, 3),
+            **catalog.memory_usage(),
+        }
+        logger.info(f"Catálogo compacto de {resource} carregado: {self.last_loads[resource]}")
+        return catalog
+
+    async def load_all(self):
+        mirror = self.service.catalog_mirror
+        for resource in settings.gw2_compact_catalogs_list:
+            # Catálogos não espelhados na build atual são carregados quando o espelho terminar (on_catalog_synced)
+            if mirror is not None and not mirror.is_current(resource):
+                continue
+            try:
+                await self.load(resource)
+            except Exception as e:
+                logger.error(f"Erro ao carregar o catálogo compacto de {resource}: {str(e)}")
+
+    # Eventos
+    async def on_build_changed(self, previous: Optional[int], build_id: int):
+        """Descarta os catálogos da build anterior e agenda a recarga"""
+        # Uma carga em andamento ainda traria dados da build anterior
+        await self._cancel_loading()
+        for resource in settings.gw2_compact_catalogs_list:
+            self.service.compact_catalogs.pop(resource, None)
+        # Com o espelho ativo, a recarga acontece quando ele termina de sincronizar (on_catalog_synced)
+        if self.service.catalog_mirror is None:
+            self._start_loading()
+
+    async def on_catalog_synced(self, resource: str, result: Dict[str, Any]):
+        """Recarrega a partir do espelho quando a sincronização mudou o catálogo"""
+        if resource not in settings.gw2_compact_catalogs_list:
+            return
+        if result["written"] or result["removed"] or resource not in self.service.compact_catalogs:
+            await self.load(resource)
+
+    # Ciclo de vida
+    def _start_loading(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.load_all())
+
+    async def start(self):
+        """Carrega os catálogos em segundo plano; até lá as rotas seguem pelo cache e pela API"""
+        self._start_loading()
+
+    async def _cancel_loading(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def stop(self):
+        await self._cancel_loading()
+        self.service.compact_catalogs.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": sorted(self.service.compact_catalogs),
+            "last_loads": self.last_loads,
+        }
+
+
+# Instância global dos catálogos compactos
+compact_catalogs = CompactCatalogStore(gw2_service)
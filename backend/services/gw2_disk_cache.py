@@ -0,0 +1,196 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from services.gw2_cache import GW2Payload
+
+# Entrada lida do disco: (payload, namespace, expira_em, stale_ate), em tempo de parede (time.time())
+DiskEntry = Tuple[GW2Payload, str, float, float]
+
+# Intervalo mínimo entre atualizações de accessed_at de uma mesma entrada
+TOUCH_INTERVAL = 60.0
+
+# Número de escritas entre verificações do tamanho do arquivo
+EVICTION_CHECK_INTERVAL = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    body BLOB NOT NULL,
+    status_code INTEGER NOT NULL,
+    content_type TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_namespace ON entries (namespace);
+CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS ix_entries_stale_until ON entries (stale_until);
+"""
+
+
+class DiskCache:
+    """Cache de respostas persistente em SQLite (modo WAL), compartilhado entre workers.
+
+    Funciona como segundo nível do ResponseCache: sobrevive a restarts e deploys e é
+    lido por todos os processos do uvicorn que apontam para o mesmo arquivo. Os
+    horários são guardados em tempo de parede para valerem entre processos, e o
+    arquivo é mantido abaixo de max_bytes descartando as entradas menos acessadas.
+    Os métodos são bloqueantes e devem ser chamados via asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, max_bytes: int, stale_ttl: float = 0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            connection.executescript(SCHEMA)
+            self._bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def get_many(self, keys: List[str]) -> Dict[str, DiskEntry]:
+        """Retorna as entradas ainda dentro da janela de stale, indexadas por chave"""
+        if not keys:
+            return {}
+        now = time.time()
+        found: Dict[str, DiskEntry] = {}
+        touched: List[Tuple[float, str]] = []
+        with self._lock:
+            connection = self._connect()
+            # O SQLite limita o número de parâmetros por consulta
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = connection.execute(
+                    "SELECT key, namespace, body, status_code, content_type, headers, expires_at, stale_until, accessed_at "
+                    f"FROM entries WHERE stale_until > ? AND key IN ({','.join('?' * len(chunk))})",
+                    [now, *chunk],
+                ).fetchall()
+                for key, namespace, body, status_code, content_type, headers, expires_at, stale_until, accessed_at in rows:
+                    payload = GW2Payload(body, status_code=status_code, content_type=content_type, headers=json.loads(headers))
+                    found[key] = (payload, namespace, expires_at, stale_until)
+                    if now - accessed_at > TOUCH_INTERVAL:
+                        touched.append((now, key))
+            if touched:
+                connection.executemany("UPDATE entries SET accessed_at = ? WHERE key = ?", touched)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Iterable[Tuple[str, GW2Payload, float, str]]):
+        """Grava entradas (chave, payload, ttl, namespace), substituindo as existentes"""
+        now = time.time()
+        rows = [
+            (
+                key, namespace, payload.body, payload.status_code, payload.content_type,
+                json.dumps(payload.headers), now + ttl, now + ttl + self.stale_ttl, payload.size, now,
+            )
+            for key, payload, ttl, namespace in items
+            if ttl > 0
+        ]
+        if not rows:
+            return
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entries "
+                    "(key, namespace, body, status_code, content_type, headers, expires_at, stale_until, size, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self.writes += len(rows)
+            self._bytes += sum(row[8] for row in rows)
+            self._writes_since_check += len(rows)
+            if self._bytes > self.max_bytes or self._writes_since_check >= EVICTION_CHECK_INTERVAL:
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection):
+        """Remove entradas fora da janela de stale e, se preciso, as menos acessadas"""
+        self._writes_since_check = 0
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute("DELETE FROM entries WHERE stale_until <= ?", (time.time(),))
+            self._bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            # Libera um pouco além do limite para não rodar a cada escrita
+            target = int(self.max_bytes * 0.9)
+            while self._bytes > target:
+                rows = connection.execute(
+                    "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 500"
+                ).fetchall()
+                if not rows:
+                    break
+                connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in rows])
+                self._bytes -= sum(size for _, size in rows)
+                self.evictions += len(rows)
+
+    def invalidate(
+        self,
+        namespace: Optional[str] = None,
+        prefix: Optional[str] = None,
+        keep_prefix: Optional[str] = None,
+    ) -> int:
+        """Remove entradas por namespace e/ou prefixo de chave, preservando as de keep_prefix"""
+        conditions: List[str] = []
+        params: List[Any] = []
+        if namespace is not None:
+            conditions.append("namespace = ?")
+            params.append(namespace)
+        if prefix is not None:
+            conditions.append("substr(key, 1, ?) = ?")
+            params.extend([len(prefix), prefix])
+        if keep_prefix is not None:
+            conditions.append("substr(key, 1, ?) != ?")
+            params.extend([len(keep_prefix), keep_prefix])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN")
+                removed = connection.execute(f"DELETE FROM entries{where}", params).rowcount
+                self._bytes = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
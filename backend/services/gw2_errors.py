@@ -0,0 +1,23 @@
+class GW2APIError(Exception):
+    """Erro base para falhas ao consultar a API do Guild Wars 2"""
+
+
+class GW2NotFoundError(GW2APIError):
+    """O recurso ou id solicitado não existe na API do Guild Wars 2"""
+    
+    def __init__(self, endpoint: str, resource_id=None, payload=None):
+        self.endpoint = endpoint
+        self.resource_id = resource_id
+        # Resposta 404 original da API (ou a guardada no cache negativo), quando disponível
+        self.payload = payload
+        target = f"{endpoint}/{resource_id}" if resource_id is not None else endpoint
+        super().__init__(f"Recurso não encontrado: {target}")
+
+
+class GW2CircuitOpenError(GW2APIError):
+    """O circuit breaker da família de endpoints está aberto e a requisição não foi enviada"""
+    
+    def __init__(self, family: str, retry_in: float):
+        self.family = family
+        self.retry_in = retry_in
+        super().__init__(f"Circuit breaker aberto para '{family}'; nova tentativa em {retry_in:.1f}s")
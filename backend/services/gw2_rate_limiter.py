@@ -0,0 +1,206 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Union
+
+# Faixas de prioridade: requisições de usuários passam na frente de atualizações em segundo plano
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+
+class FlightPriority:
+    """Prioridade de uma requisição upstream compartilhada por vários chamadores.
+
+    Começa com a prioridade de quem abriu a requisição e sobe (promote) quando um
+    chamador mais prioritário passa a aguardá-la; buscas abertas de dentro dela
+    herdam a prioridade via `parent`.
+    """
+    __slots__ = ("value", "parent")
+
+    def __init__(self, value: int, parent: Optional["FlightPriority"] = None):
+        self.value = value
+        self.parent = parent
+
+    @property
+    def current(self) -> int:
+        if self.parent is None:
+            return self.value
+        return min(self.value, self.parent.current)
+
+    def promote(self, priority: int) -> bool:
+        """Sobe a prioridade para `priority` se ela for maior; retorna se mudou"""
+        if priority >= self.current:
+            return False
+        self.value = priority
+        return True
+
+
+_request_priority: ContextVar[Union[int, FlightPriority]] = ContextVar("gw2_request_priority", default=PRIORITY_INTERACTIVE)
+
+
+def current_priority() -> int:
+    """Retorna a prioridade das requisições feitas no contexto atual"""
+    priority = _request_priority.get()
+    return priority.current if isinstance(priority, FlightPriority) else priority
+
+
+def current_flight() -> Optional[FlightPriority]:
+    """Retorna a requisição compartilhada em execução no contexto atual, se houver"""
+    priority = _request_priority.get()
+    return priority if isinstance(priority, FlightPriority) else None
+
+
+@contextmanager
+def request_priority(priority: Union[int, FlightPriority]):
+    """Define a prioridade das requisições upstream feitas dentro do bloco"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def background_priority():
+    """Atalho para executar tarefas de segundo plano com prioridade baixa"""
+    return request_priority(PRIORITY_BACKGROUND)
+
+
+class TokenBucketRateLimiter:
+    """Token bucket com filas por prioridade para as requisições à API do GW2.
+
+    A taxa de reposição é reduzida pela metade a cada 429 recebido e recuperada
+    gradualmente a cada resposta bem-sucedida; um Retry-After bloqueia o bucket
+    inteiro até o instante indicado.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, min_rate_factor: float = 0.1):
+        self.base_rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.min_rate_factor = min_rate_factor
+        self.rate_factor = 1.0
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        # Entradas [prioridade, sequência, future, FlightPriority ou None], em heap
+        self._waiters: List[List[Any]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.base_rate * self.rate_factor
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    async def acquire(self, priority: Optional[int] = None):
+        """Aguarda um token disponível respeitando a prioridade da requisição"""
+        flight = None
+        if priority is None:
+            flight = current_flight()
+            priority = current_priority()
+        started = time.monotonic()
+        self._refill(started)
+        if not self._waiters and started >= self._blocked_until and self._tokens >= 1:
+            self._tokens -= 1
+            self.acquired += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._sequence), future, flight])
+        self._schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # O token já concedido volta para o bucket se o chamador desistiu
+            if future.done() and not future.cancelled():
+                self._tokens += 1
+            raise
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def _schedule_wakeup(self):
+        if self._wakeup is not None or not self._waiters:
+            return
+        now = time.monotonic()
+        delay = max(self._blocked_until - now, (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0)
+        self._wakeup = asyncio.get_running_loop().call_later(max(delay, 0.0), self._release_waiters)
+
+    def _release_waiters(self):
+        self._wakeup = None
+        now = time.monotonic()
+        self._refill(now)
+        if now >= self._blocked_until:
+            while self._waiters and self._tokens >= 1:
+                future = heapq.heappop(self._waiters)[2]
+                if future.done():
+                    continue
+                self._tokens -= 1
+                future.set_result(None)
+        # Descarta chamadores cancelados no topo da fila
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule_wakeup()
+
+    def reprioritize(self):
+        """Reordena a fila depois que alguma FlightPriority foi promovida"""
+        for waiter in self._waiters:
+            if waiter[3] is not None:
+                waiter[0] = waiter[3].current
+        heapq.heapify(self._waiters)
+
+    def on_success(self):
+        """Recupera a taxa gradualmente após respostas bem-sucedidas"""
+        if self.rate_factor < 1.0:
+            self.rate_factor = min(1.0, self.rate_factor + 0.05)
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """Reduz a taxa após um 429 e bloqueia o bucket pelo tempo do Retry-After"""
+        now = time.monotonic()
+        self._refill(now)
+        self.throttled += 1
+        self.rate_factor = max(self.min_rate_factor, self.rate_factor / 2)
+        self._tokens = 0.0
+        if retry_after:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        queued = [priority for priority, _, future, _ in self._waiters if not future.done()]
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "base_rate_per_minute": round(self.base_rate * 60, 2),
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "queue_depth": len(queued),
+            "queue_depth_interactive": queued.count(PRIORITY_INTERACTIVE),
+            "queue_depth_background": queued.count(PRIORITY_BACKGROUND),
+            "blocked_for": round(max(0.0, self._blocked_until - now), 3),
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Converte o header Retry-After (em segundos) para float"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
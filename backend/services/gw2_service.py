@@ -1,46 +1,720 @@
 import httpx
 import asyncio
-from typing import Optional, List, Dict, Any, Union
+import sqlite3
+import time
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Awaitable, Callable, Iterable, Set, Tuple, Union
 from app.config import settings
+from app.metrics import observe_upstream
+from app.middleware import set_response_header
+from services.gw2_cache import (
+    ResponseCache, GW2Payload, MISS, PASSTHROUGH_HEADERS, CACHE_TIER_STATIC, CACHE_NAMESPACE_NOT_FOUND,
+    NOT_FOUND_BODY, cache_key, cache_tier, tier_ttl
+)
+from services.gw2_batching import BatchLoader
+from services.gw2_disk_cache import DiskCache
+from services.gw2_rate_limiter import (
+    FlightPriority, TokenBucketRateLimiter, current_flight, current_priority, parse_retry_after, request_priority
+)
+from services.gw2_circuit_breaker import CircuitBreakerRegistry
+from services.gw2_errors import GW2APIError, GW2CircuitOpenError, GW2NotFoundError
 import logging
 
 logger = logging.getLogger(__name__)
 
+# A API do GW2 rejeita requisições com mais de 200 ids
+MAX_IDS_PER_REQUEST = 200
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Endpoints cujo segundo segmento é um nome ou id (characters/Nome, guild/<guid>)
+NAMED_RESOURCE_ENDPOINTS = ("characters", "guild")
+
+def metrics_endpoint(endpoint: str) -> str:
+    """Rótulo de baixa cardinalidade para métricas: descarta ids e nomes do caminho"""
+    parts = endpoint.split("?", 1)[0].split("/")
+    if len(parts) > 1 and parts[0] not in NAMED_RESOURCE_ENDPOINTS and not parts[1].isdigit():
+        return f"{parts[0]}/{parts[1]}"
+    return parts[0]
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Indica se o erro reflete indisponibilidade da API (e não um erro do cliente, como 404)"""
+    if isinstance(error, (httpx.RequestError, GW2CircuitOpenError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return False
+
+class GW2BatchResult(list):
+    """Resultado de uma busca por ids dividida em lotes, com os ids que falharam"""
+    
+    def __init__(self, entries=(), failed_ids=None, errors=None, stale_ids=None):
+        super().__init__(entries)
+        self.failed_ids: List[Any] = failed_ids or []
+        self.errors: List[Exception] = errors or []
+        self.stale_ids: List[Any] = stale_ids or []
+    
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed_ids)
+
 class GW2APIService:
     def __init__(self):
         self.base_url = settings.gw2_api_base_url
         self.timeout = settings.gw2_api_timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests_total = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._inflight_priorities: Dict[str, FlightPriority] = {}
+        self._coalesced_requests = 0
+        self._batch_semaphore = asyncio.Semaphore(settings.gw2_batch_concurrency)
+        self._loaders: Dict[str, BatchLoader] = {}
+        self.build_id: Optional[int] = None
+        # Espelho local dos catálogos no Postgres (ver services.gw2_catalog_sync)
+        self.catalog_mirror: Optional[Any] = None
+        # Catálogos compactos em memória, por endpoint (ver services.gw2_compact_catalog)
+        self.compact_catalogs: Dict[str, Any] = {}
+        # O limite da API é por IP: cada worker do uvicorn fica com uma fração igual do orçamento
+        workers = max(1, settings.gw2_rate_limit_workers)
+        self.rate_limiter = TokenBucketRateLimiter(
+            rate_per_minute=settings.gw2_rate_limit_per_minute / workers,
+            burst=max(1, settings.gw2_rate_limit_burst // workers),
+        )
+        self.cache = ResponseCache(
+            max_bytes=settings.gw2_cache_max_bytes,
+            max_entries=settings.gw2_cache_max_entries,
+            stale_ttl=settings.gw2_cache_stale_ttl,
+        )
+        # Segundo nível do cache, em disco e compartilhado entre os workers
+        self.disk_cache: Optional[DiskCache] = None
+        if settings.gw2_disk_cache_enabled:
+            self.disk_cache = DiskCache(
+                settings.gw2_disk_cache_path,
+                max_bytes=settings.gw2_disk_cache_max_bytes,
+                stale_ttl=settings.gw2_cache_stale_ttl,
+            )
+        self._background_tasks: Set[asyncio.Task] = set()
+        self.circuit_breakers = CircuitBreakerRegistry(
+            failure_threshold=settings.gw2_circuit_failure_threshold,
+            reset_timeout=settings.gw2_circuit_reset_timeout,
+        )
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        """Cria o cliente HTTP compartilhado com pool de conexões"""
+        http2 = settings.gw2_http2 and HTTP2_AVAILABLE
+        if settings.gw2_http2 and not HTTP2_AVAILABLE:
+            logger.warning("Pacote 'h2' não instalado; usando HTTP/1.1 para a API do GW2")
+        limits = httpx.Limits(
+            max_connections=settings.gw2_max_connections,
+            max_keepalive_connections=settings.gw2_max_keepalive_connections,
+            keepalive_expiry=settings.gw2_keepalive_expiry,
+        )
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=limits,
+            http2=http2,
+        )
+    
+    async def start(self):
+        """Abre o cliente HTTP de longa duração (chamado no lifespan da aplicação)"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+    
+    async def close(self):
+        """Fecha o cliente HTTP e libera as conexões do pool"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        if self.disk_cache is not None:
+            await asyncio.to_thread(self.disk_cache.close)
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Retorna o cliente compartilhado, criando-o sob demanda fora do lifespan"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do pool de conexões com a API do GW2"""
+        stats: Dict[str, Any] = {
+            "http2": bool(self._client is not None and settings.gw2_http2 and HTTP2_AVAILABLE),
+            "max_connections": settings.gw2_max_connections,
+            "max_keepalive_connections": settings.gw2_max_keepalive_connections,
+            "keepalive_expiry": settings.gw2_keepalive_expiry,
+            "requests_total": self._requests_total,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "coalesced_requests": self._coalesced_requests,
+            "inflight_keys": len(self._inflight),
+            "connections": 0,
+            "idle_connections": 0,
+            "active_connections": 0,
+            "http2_connections": 0,
+        }
+        if self._client is None:
+            return stats
+        # O httpx não expõe o pool publicamente; inspecionamos o transporte do httpcore
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        for connection in getattr(pool, "connections", []):
+            stats["connections"] += 1
+            if connection.is_idle():
+                stats["idle_connections"] += 1
+            else:
+                stats["active_connections"] += 1
+            if "HTTP/2" in connection.info():
+                stats["http2_connections"] += 1
+        return stats
+        
+    def invalidate_cache(
+        self,
+        namespace: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> int:
+        """Invalida respostas em cache por camada, prefixo de endpoint e/ou chave de API"""
+        prefix = self._cache_key(endpoint or "", api_key=api_key) if endpoint or api_key else None
+        removed = self.cache.invalidate(namespace=namespace, prefix=prefix)
+        # Respostas de conta nunca vão para o disco
+        if self.disk_cache is not None and not api_key:
+            self._spawn(self._disk_call(self.disk_cache.invalidate, namespace, prefix))
+        logger.info(f"Cache do GW2 invalidado: {removed} entradas removidas")
+        return removed
+    
+    def set_build(self, build_id: int):
+        """Registra a build atual do jogo; entradas estáticas de builds anteriores são descartadas"""
+        previous = self.build_id
+        self.build_id = build_id
+        if previous is not None and previous != build_id:
+            removed = self.cache.invalidate(namespace=CACHE_TIER_STATIC)
+            logger.info(f"Cache do GW2 invalidado: {removed} entradas removidas")
+            if self.disk_cache is not None:
+                # Outros workers podem já ter gravado entradas da build nova
+                self._spawn(self._disk_call(
+                    self.disk_cache.invalidate, CACHE_TIER_STATIC, None, f"b{build_id}:"
+                ))
+    
+    def _spawn(self, coroutine: Awaitable[Any]):
+        """Executa uma tarefa de manutenção em segundo plano mantendo uma referência a ela"""
+        task = asyncio.ensure_future(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _disk_call(self, function: Callable[..., Any], *args: Any, default: Any = None) -> Any:
+        """Executa uma operação do cache em disco em uma thread; falhas não interrompem a requisição"""
+        try:
+            return await asyncio.to_thread(function, *args)
+        except (sqlite3.Error, OSError) as e:
+            self.disk_cache.errors += 1
+            logger.warning(f"Erro no cache em disco do GW2: {str(e)}")
+            return default
+    
+    async def _load_from_disk(self, keys: List[str]) -> Tuple[Dict[str, GW2Payload], Dict[str, GW2Payload]]:
+        """Busca chaves no cache em disco e retorna (válidas, stale).
         
+        As entradas válidas são promovidas ao cache em memória com o tempo de vida restante.
+        """
+        if self.disk_cache is None or not keys:
+            return {}, {}
+        entries = await self._disk_call(self.disk_cache.get_many, keys, default={})
+        now = time.time()
+        fresh: Dict[str, GW2Payload] = {}
+        stale: Dict[str, GW2Payload] = {}
+        for key, (payload, namespace, expires_at, stale_until) in entries.items():
+            if expires_at > now:
+                fresh[key] = payload
+                self.cache.set(
+                    key, payload,
+                    ttl=expires_at - now,
+                    size=payload.size,
+                    namespace=namespace,
+                    stale_ttl=stale_until - expires_at,
+                )
+            else:
+                stale[key] = payload
+        return fresh, stale
+    
+    async def _store(self, items: List[Tuple[str, GW2Payload, float, str]], persist: bool = True):
+        """Guarda entradas (chave, payload, ttl, namespace) no cache em memória e no disco"""
+        if not settings.gw2_cache_enabled or not items:
+            return
+        for key, payload, ttl, namespace in items:
+            self.cache.set(key, payload, ttl=ttl, size=payload.size, namespace=namespace)
+        if persist and self.disk_cache is not None:
+            await self._disk_call(self.disk_cache.set_many, items)
+    
+    def _cache_key(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None
+    ) -> str:
+        """Monta a chave de cache, incluindo a build atual para catálogos estáticos"""
+        build = self.build_id if cache_tier(endpoint, api_key) == CACHE_TIER_STATIC else None
+        return cache_key(endpoint, params, api_key, build=build)
+    
+    def _ttl(self, tier: str) -> float:
+        return tier_ttl(tier, build_scoped=self.build_id is not None)
+    
     async def _make_request(
         self, 
         endpoint: str, 
         params: Optional[Dict[str, Any]] = None,
         api_key: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Faz uma requisição para a API do Guild Wars 2"""
+        """Faz uma requisição para a API do Guild Wars 2 e retorna o JSON decodificado"""
+        payload = await self.get_payload(endpoint, params, api_key)
+        return payload.data
+    
+    async def get_payload(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None
+    ) -> GW2Payload:
+        """Retorna a resposta da API do Guild Wars 2 como bytes, servindo do cache quando possível.
+        
+        Se existir uma cópia expirada em cache, ela é servida (marcada como stale) quando
+        a API falha, está com o circuit breaker aberto ou demora mais que gw2_stale_timeout;
+        nesse último caso a requisição continua em segundo plano e atualiza o cache.
+        Respostas 404 ficam no cache negativo por gw2_cache_ttl_not_found e levantam
+        GW2NotFoundError sem nova consulta upstream.
+        """
+        if self.build_id is not None:
+            set_response_header("X-GW2-Build", str(self.build_id))
+        key = self._cache_key(endpoint, params, api_key)
+        stale = MISS
+        if settings.gw2_cache_enabled:
+            cached = self.cache.get(key)
+            if cached is MISS and not api_key:
+                fresh, stale_on_disk = await self._load_from_disk([key])
+                cached = fresh.get(key, MISS)
+                stale = stale_on_disk.get(key, MISS)
+            if cached is not MISS:
+                if cached.not_found:
+                    raise GW2NotFoundError(endpoint, payload=cached)
+                return cached
+            if stale is MISS:
+                stale = self.cache.get_stale(key)
+            if stale is not MISS and stale.not_found:
+                stale = MISS
+        if stale is MISS:
+            return await self._coalesced_fetch(key, endpoint, params, api_key)
+        
+        try:
+            return await asyncio.wait_for(
+                self._coalesced_fetch(key, endpoint, params, api_key),
+                timeout=settings.gw2_stale_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"API do GW2 lenta para {endpoint}; servindo resposta stale do cache")
+        except (httpx.HTTPError, GW2APIError) as e:
+            if not is_upstream_failure(e):
+                raise
+            logger.warning(f"API do GW2 indisponível para {endpoint}; servindo resposta stale do cache: {str(e)}")
+        self._mark_stale()
+        return stale
+    
+    def _mark_stale(self):
+        self.cache.record_stale_hit()
+        self._set_stale_headers()
+    
+    def _set_stale_headers(self):
+        set_response_header("X-GW2-Stale", "true")
+        set_response_header("Warning", '110 - "Response is Stale"')
+    
+    async def _coalesced_fetch(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None
+    ) -> GW2Payload:
+        return await self._single_flight(key, lambda: self._fetch_and_store(key, endpoint, params, api_key))
+    
+    async def _single_flight(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Compartilha uma única requisição upstream entre chamadores concorrentes da mesma chave.
+        
+        A requisição roda em uma task própria protegida por shield: o cancelamento de um
+        chamador não cancela a busca dos demais, e erros são propagados a todos. Ela usa
+        a prioridade mais alta entre os chamadores: um usuário que se junta a uma busca
+        aberta pelo aquecimento ou pela sincronização a tira da faixa de segundo plano.
+        """
+        priority = current_priority()
+        task = self._inflight.get(key)
+        if task is None:
+            flight = FlightPriority(priority, parent=current_flight())
+            with request_priority(flight):
+                task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self._inflight_priorities[key] = flight
+            task.add_done_callback(lambda done: self._release_inflight(key, done))
+        else:
+            self._coalesced_requests += 1
+            if self._inflight_priorities[key].promote(priority):
+                self.rate_limiter.reprioritize()
+        return await asyncio.shield(task)
+    
+    def _release_inflight(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._inflight_priorities[key]
+        # Marca a exceção como consumida mesmo que todos os chamadores tenham sido cancelados
+        if not task.cancelled():
+            task.exception()
+    
+    async def _fetch_and_store(
+        self,
+        key: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None
+    ) -> GW2Payload:
+        try:
+            payload = await self._fetch(endpoint, params, api_key)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            payload = GW2Payload(
+                e.response.content,
+                status_code=404,
+                content_type=e.response.headers.get("content-type", "application/json; charset=utf-8"),
+            )
+            await self._store_not_found([key], payload, persist=not api_key)
+            raise GW2NotFoundError(endpoint, payload=payload) from e
+        tier = cache_tier(endpoint, api_key)
+        await self._store([(key, payload, self._ttl(tier), tier)], persist=not api_key)
+        return payload
+    
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None
+    ) -> GW2Payload:
+        """Executa a requisição HTTP e retorna o corpo da resposta sem decodificar"""
+        breaker = self.circuit_breakers.for_endpoint(endpoint)
+        if settings.gw2_circuit_breaker_enabled and not breaker.allow():
+            raise GW2CircuitOpenError(breaker.name, breaker.retry_in())
+        
+        try:
+            result = await self._send(endpoint, params, api_key)
+        except asyncio.CancelledError:
+            breaker.abort_trial()
+            raise
+        except Exception as e:
+            if is_upstream_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+    
+    async def _send(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        api_key: Optional[str] = None
+    ) -> GW2Payload:
         url = f"{self.base_url}/{endpoint}"
         
         # Adiciona a chave de API se fornecida
         if api_key:
-            if params is None:
-                params = {}
+            params = dict(params or {})
             params["access_token"] = api_key
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
+        for attempt in range(settings.gw2_rate_limit_max_retries + 1):
+            if settings.gw2_rate_limit_enabled:
+                await self.rate_limiter.acquire()
+            
+            self._requests_total += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            started = time.perf_counter()
+            upstream_status: Any = "error"
             try:
-                response = await client.get(url, params=params)
+                response = await self.client.get(endpoint, params=params)
+                upstream_status = response.status_code
+                if response.status_code == 429 and settings.gw2_rate_limit_enabled:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.rate_limiter.on_throttled(retry_after)
+                    if attempt < settings.gw2_rate_limit_max_retries:
+                        logger.warning(f"Limite de requisições atingido para {url}; nova tentativa após espera")
+                        continue
                 response.raise_for_status()
-                return response.json()
+                self.rate_limiter.on_success()
+                return GW2Payload(
+                    response.content,
+                    status_code=response.status_code,
+                    content_type=response.headers.get("content-type", "application/json; charset=utf-8"),
+                    headers={
+                        name: response.headers[name]
+                        for name in PASSTHROUGH_HEADERS if name in response.headers
+                    },
+                )
             except httpx.HTTPStatusError as e:
-                logger.error(f"Erro HTTP {e.response.status_code} para {url}: {e.response.text}")
+                if e.response.status_code == 404:
+                    # Ids inexistentes são um resultado esperado (e vão para o cache negativo)
+                    logger.debug(f"Recurso não encontrado em {url}: {e.response.text}")
+                else:
+                    logger.error(f"Erro HTTP {e.response.status_code} para {url}: {e.response.text}")
                 raise
             except httpx.RequestError as e:
                 logger.error(f"Erro de requisição para {url}: {str(e)}")
                 raise
+            finally:
+                self._in_flight -= 1
+                observe_upstream(metrics_endpoint(endpoint), upstream_status, time.perf_counter() - started)
+    
+    def _entity_key(self, endpoint: str, resource_id: Any) -> str:
+        return self._cache_key(f"{endpoint}/{resource_id}")
+    
+    async def _store_entities(self, endpoint: str, entries: Iterable[Dict[str, Any]]):
+        """Guarda cada entrada de um lote no cache com a mesma chave da busca por id"""
+        if not settings.gw2_cache_enabled:
+            return
+        tier = cache_tier(endpoint)
+        ttl = self._ttl(tier)
+        await self._store([
+            (self._entity_key(endpoint, entry["id"]), GW2Payload.from_data(entry), ttl, tier)
+            for entry in entries
+        ])
+    
+    async def _store_not_found(self, keys: Iterable[str], payload: Optional[GW2Payload] = None, persist: bool = True):
+        """Guarda respostas 404 no cache negativo para não repetir a consulta upstream"""
+        if not settings.gw2_cache_enabled:
+            return
+        payload = payload or GW2Payload(NOT_FOUND_BODY, status_code=404)
+        ttl = settings.gw2_cache_ttl_not_found
+        await self._store([(key, payload, ttl, CACHE_NAMESPACE_NOT_FOUND) for key in keys], persist=persist)
+    
+    async def _fetch_entities(self, endpoint: str, ids: List[Any]) -> List[Dict[str, Any]]:
+        try:
+            payload = await self._fetch(endpoint, params={"ids": ",".join(map(str, ids))})
+        except httpx.HTTPStatusError as e:
+            # A API responde 404 quando nenhum dos ids existe ("all ids provided are invalid")
+            if e.response.status_code != 404:
+                raise
+            entries = []
+        else:
+            entries = payload.data
+        await self._store_entities(endpoint, entries)
+        found = {str(entry.get("id")) for entry in entries}
+        await self._store_not_found([self._entity_key(endpoint, id) for id in ids if str(id) not in found])
+        return entries
+    
+    async def _get_by_ids(self, endpoint: str, ids: List[Any]) -> GW2BatchResult:
+        """Busca entradas por id usando o cache por entrada e lotes paralelos de até 200 ids.
+        
+        Os ids são deduplicados; os que já estão no catálogo compacto, em cache ou no espelho local são servidos
+        diretamente e só os ausentes vão upstream, em lotes ordenados para que conjuntos
+        iguais gerem as mesmas requisições. O resultado segue a ordem dos ids solicitados.
+        Se apenas alguns lotes falharem, os ids afetados são servidos stale quando possível
+        ou reportados em failed_ids e no header X-GW2-Failed-Ids-Count; lotes em que todos
+        os ids têm cópia stale esperam no máximo gw2_stale_timeout. Se nada puder ser
+        servido, o primeiro erro é propagado. Ids inexistentes ficam no cache negativo;
+        se nenhum dos ids existir, levanta GW2NotFoundError.
+        """
+        if self.build_id is not None:
+            set_response_header("X-GW2-Build", str(self.build_id))
+        unique_ids = list(dict.fromkeys(ids))
+        
+        # Catálogos compactos respondem sem passar pelo cache de respostas
+        catalog = self.compact_catalogs.get(endpoint)
+        by_id: Dict[Any, Dict[str, Any]] = catalog.get_many(unique_ids) if catalog is not None else {}
+        pending_ids = [id for id in unique_ids if id not in by_id]
+        
+        missing_ids: List[Any] = []
+        stale_on_disk: Dict[str, GW2Payload] = {}
+        if settings.gw2_cache_enabled:
+            keys = {id: self._entity_key(endpoint, id) for id in pending_ids}
+            cached = {id: self.cache.get(key) for id, key in keys.items()}
+            if self.disk_cache is not None:
+                fresh, stale_on_disk = await self._load_from_disk([keys[id] for id, value in cached.items() if value is MISS])
+                for id, value in cached.items():
+                    if value is MISS:
+                        cached[id] = fresh.get(keys[id], MISS)
+            for id, value in cached.items():
+                if value is MISS:
+                    missing_ids.append(id)
+                elif not value.not_found:
+                    by_id[id] = value.data
+        else:
+            missing_ids = pending_ids
+        
+        # Catálogos espelhados no Postgres (na build atual) são servidos localmente; só o restante vai upstream
+        mirror = self.catalog_mirror
+        if missing_ids and mirror is not None and mirror.is_current(endpoint):
+            try:
+                mirrored = await mirror.get_many(endpoint, missing_ids)
+            except Exception as e:
+                logger.warning(f"Erro ao consultar o espelho local de {endpoint}: {str(e)}")
+            else:
+                by_id.update(mirrored)
+                await self._store_entities(endpoint, mirrored.values())
+                missing_ids = [id for id in missing_ids if id not in mirrored]
+        
+        missing_ids.sort()
+        chunk_size = min(settings.gw2_batch_chunk_size, MAX_IDS_PER_REQUEST)
+        chunks = [missing_ids[i:i + chunk_size] for i in range(0, len(missing_ids), chunk_size)]
+        
+        # Cópias expiradas que substituem os ids quando a API falha ou demora
+        stale_by_id: Dict[Any, GW2Payload] = {}
+        if settings.gw2_cache_enabled:
+            for id in missing_ids:
+                key = self._entity_key(endpoint, id)
+                stale = self.cache.get_stale(key)
+                if stale is MISS:
+                    stale = stale_on_disk.get(key, MISS)
+                if stale is not MISS and not stale.not_found:
+                    stale_by_id[id] = stale
+        
+        async def fetch_chunk(chunk: List[Any]) -> List[Dict[str, Any]]:
+            key = "ids:" + self._cache_key(endpoint, {"ids": ",".join(map(str, chunk))})
+            async with self._batch_semaphore:
+                return await self._single_flight(key, lambda: self._fetch_entities(endpoint, chunk))
+        
+        async def wait_chunk(chunk: List[Any]) -> List[Dict[str, Any]]:
+            task = asyncio.ensure_future(fetch_chunk(chunk))
+            if not all(id in stale_by_id for id in chunk):
+                return await task
+            # Como em get_payload, a espera é limitada a gw2_stale_timeout quando todos os ids
+            # têm cópia stale; a busca continua em segundo plano e atualiza o cache
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            return await asyncio.wait_for(asyncio.shield(task), timeout=settings.gw2_stale_timeout)
+        
+        results = await asyncio.gather(*(wait_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        
+        failed_ids: List[Any] = []
+        errors: List[Exception] = []
+        stale_ids: List[Any] = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                timed_out = isinstance(result, asyncio.TimeoutError)
+                if timed_out:
+                    logger.warning(f"API do GW2 lenta para {endpoint}; servindo {len(chunk)} ids stale do cache")
+                else:
+                    errors.append(result)
+                for id in chunk:
+                    stale = stale_by_id.get(id) if timed_out or is_upstream_failure(result) else None
+                    if stale is None:
+                        failed_ids.append(id)
+                    else:
+                        by_id[id] = stale.data
+                        stale_ids.append(id)
+                continue
+            for entry in result:
+                by_id[entry.get("id")] = entry
+        
+        if not by_id:
+            if errors:
+                raise errors[0]
+            if unique_ids:
+                raise GW2NotFoundError(endpoint)
+        if stale_ids:
+            self._mark_stale()
+        if failed_ids:
+            logger.warning(f"{len(failed_ids)} de {len(unique_ids)} ids falharam em {endpoint}: {errors[0]}")
+            set_response_header("X-GW2-Failed-Ids-Count", str(len(failed_ids)))
+        
+        return GW2BatchResult(
+            (by_id[id] for id in unique_ids if id in by_id),
+            failed_ids=failed_ids,
+            errors=errors,
+            stale_ids=stale_ids,
+        )
+    
+    async def get_raw_by_ids(self, endpoint: str, ids: List[Any]) -> bytes:
+        """Busca entradas por id como _get_by_ids e monta o array JSON com os bytes do cache.
+
+        Entradas sem cópia em cache (cache desabilitado ou vindas do catálogo compacto)
+        são serializadas uma a uma; as demais não passam por json.dumps.
+        """
+        entries = await self._get_by_ids(endpoint, ids)
+        bodies = []
+        for entry in entries:
+            cached = self.cache.get_stale(self._entity_key(endpoint, entry.get("id"))) if settings.gw2_cache_enabled else MISS
+            payload = cached if cached is not MISS and not cached.not_found else GW2Payload.from_data(entry)
+            bodies.append(payload.body)
+        return b"[" + b",".join(bodies) + b"]"
+
+    def _loader(self, endpoint: str) -> BatchLoader:
+        loader = self._loaders.get(endpoint)
+        if loader is None:
+            loader = BatchLoader(
+                endpoint,
+                lambda ids: self._get_by_ids(endpoint, ids),
+                window=settings.gw2_batch_window_ms / 1000,
+                max_batch_size=min(settings.gw2_batch_chunk_size, MAX_IDS_PER_REQUEST),
+            )
+            self._loaders[endpoint] = loader
+        return loader
+    
+    async def _get_by_id(self, endpoint: str, resource_id: Any) -> Dict[str, Any]:
+        """Busca uma entrada por id, agrupando buscas concorrentes do mesmo recurso em um lote"""
+        catalog = self.compact_catalogs.get(endpoint)
+        if catalog is not None:
+            entry = catalog.get(resource_id)
+            if entry is not None:
+                if self.build_id is not None:
+                    set_response_header("X-GW2-Build", str(self.build_id))
+                return entry
+        if settings.gw2_batch_window_ms <= 0:
+            return await self._make_request(f"{endpoint}/{resource_id}")
+        if self.build_id is not None:
+            set_response_header("X-GW2-Build", str(self.build_id))
+        key = self._entity_key(endpoint, resource_id)
+        stale = MISS
+        if settings.gw2_cache_enabled:
+            cached = self.cache.get(key)
+            if cached is not MISS:
+                if cached.not_found:
+                    raise GW2NotFoundError(endpoint, resource_id, payload=cached)
+                return cached.data
+            stale = self.cache.get_stale(key)
+            if stale is not MISS and stale.not_found:
+                stale = MISS
+        load = self._loader(endpoint).load(resource_id)
+        try:
+            # Com uma cópia stale, a espera pelo lote é limitada como em get_payload (o lote segue e atualiza o cache)
+            if stale is MISS:
+                result = await load
+            else:
+                result = await asyncio.wait_for(load, timeout=settings.gw2_stale_timeout)
+            # O lote roda em outro contexto: os headers são aplicados aqui, na requisição do chamador
+            if result.error is not None:
+                set_response_header("X-GW2-Failed-Ids-Count", "1")
+                raise result.error
+            if result.stale:
+                self._set_stale_headers()
+            return result.entry
+        except asyncio.TimeoutError:
+            logger.warning(f"API do GW2 lenta para {endpoint}/{resource_id}; servindo resposta stale do cache")
+        except (httpx.HTTPError, GW2APIError) as e:
+            if stale is MISS or not is_upstream_failure(e):
+                raise
+        self._mark_stale()
+        return stale.data
+    
+    def get_batching_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas dos agrupadores de buscas por id"""
+        return {endpoint: loader.stats() for endpoint, loader in self._loaders.items()}
     
     # Endpoints públicos (não requerem autenticação)
     async def get_build(self) -> Dict[str, Any]:
         """Retorna o ID da build atual"""
+        if self.build_id is not None:
+            return {"id": self.build_id}
         return await self._make_request("build")
     
     async def get_worlds(self) -> List[Dict[str, Any]]:
@@ -49,27 +723,27 @@ class GW2APIService:
     
     async def get_world_by_id(self, world_id: int) -> Dict[str, Any]:
         """Retorna informações de um mundo específico"""
-        return await self._make_request(f"worlds/{world_id}")
+        return await self._get_by_id("worlds", world_id)
     
     async def get_items(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna lista de IDs de itens ou informações de itens específicos"""
         if ids:
-            return await self._make_request("items", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("items", ids)
         return await self._make_request("items")
     
     async def get_item_by_id(self, item_id: int) -> Dict[str, Any]:
         """Retorna informações de um item específico"""
-        return await self._make_request(f"items/{item_id}")
+        return await self._get_by_id("items", item_id)
     
     async def get_achievements(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna lista de IDs de conquistas ou informações de conquistas específicas"""
         if ids:
-            return await self._make_request("achievements", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("achievements", ids)
         return await self._make_request("achievements")
     
     async def get_achievement_by_id(self, achievement_id: int) -> Dict[str, Any]:
         """Retorna informações de uma conquista específica"""
-        return await self._make_request(f"achievements/{achievement_id}")
+        return await self._get_by_id("achievements", achievement_id)
     
     async def get_daily_achievements(self) -> Dict[str, Any]:
         """Retorna conquistas diárias"""
@@ -82,34 +756,34 @@ class GW2APIService:
     async def get_achievement_groups(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna grupos de conquistas"""
         if ids:
-            return await self._make_request("achievements/groups", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("achievements/groups", ids)
         return await self._make_request("achievements/groups")
     
     async def get_achievement_categories(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna categorias de conquistas"""
         if ids:
-            return await self._make_request("achievements/categories", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("achievements/categories", ids)
         return await self._make_request("achievements/categories")
     
     async def get_maps(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna mapas"""
         if ids:
-            return await self._make_request("maps", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("maps", ids)
         return await self._make_request("maps")
     
     async def get_map_by_id(self, map_id: int) -> Dict[str, Any]:
         """Retorna informações de um mapa específico"""
-        return await self._make_request(f"maps/{map_id}")
+        return await self._get_by_id("maps", map_id)
     
     async def get_continents(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna continentes"""
         if ids:
-            return await self._make_request("continents", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("continents", ids)
         return await self._make_request("continents")
     
     async def get_continent_by_id(self, continent_id: int) -> Dict[str, Any]:
         """Retorna informações de um continente específico"""
-        return await self._make_request(f"continents/{continent_id}")
+        return await self._get_by_id("continents", continent_id)
     
     async def get_races(self) -> List[str]:
         """Retorna raças"""
@@ -122,32 +796,32 @@ class GW2APIService:
     async def get_skills(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna habilidades"""
         if ids:
-            return await self._make_request("skills", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("skills", ids)
         return await self._make_request("skills")
     
     async def get_skill_by_id(self, skill_id: int) -> Dict[str, Any]:
         """Retorna informações de uma habilidade específica"""
-        return await self._make_request(f"skills/{skill_id}")
+        return await self._get_by_id("skills", skill_id)
     
     async def get_traits(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna características"""
         if ids:
-            return await self._make_request("traits", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("traits", ids)
         return await self._make_request("traits")
     
     async def get_trait_by_id(self, trait_id: int) -> Dict[str, Any]:
         """Retorna informações de uma característica específica"""
-        return await self._make_request(f"traits/{trait_id}")
+        return await self._get_by_id("traits", trait_id)
     
     async def get_specializations(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna especializações"""
         if ids:
-            return await self._make_request("specializations", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("specializations", ids)
         return await self._make_request("specializations")
     
     async def get_specialization_by_id(self, specialization_id: int) -> Dict[str, Any]:
         """Retorna informações de uma especialização específica"""
-        return await self._make_request(f"specializations/{specialization_id}")
+        return await self._get_by_id("specializations", specialization_id)
     
     async def get_legends(self) -> List[str]:
         """Retorna lendas de revenant"""
@@ -156,12 +830,12 @@ class GW2APIService:
     async def get_pets(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna pets"""
         if ids:
-            return await self._make_request("pets", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("pets", ids)
         return await self._make_request("pets")
     
     async def get_pet_by_id(self, pet_id: int) -> Dict[str, Any]:
         """Retorna informações de um pet específico"""
-        return await self._make_request(f"pets/{pet_id}")
+        return await self._get_by_id("pets", pet_id)
     
     async def get_mounts_types(self) -> List[str]:
         """Retorna tipos de montarias"""
@@ -170,88 +844,88 @@ class GW2APIService:
     async def get_mounts_skins(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna skins de montarias"""
         if ids:
-            return await self._make_request("mounts/skins", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("mounts/skins", ids)
         return await self._make_request("mounts/skins")
     
     async def get_outfits(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna outfits"""
         if ids:
-            return await self._make_request("outfits", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("outfits", ids)
         return await self._make_request("outfits")
     
     async def get_outfit_by_id(self, outfit_id: int) -> Dict[str, Any]:
         """Retorna informações de um outfit específico"""
-        return await self._make_request(f"outfits/{outfit_id}")
+        return await self._get_by_id("outfits", outfit_id)
     
     async def get_skins(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna skins"""
         if ids:
-            return await self._make_request("skins", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("skins", ids)
         return await self._make_request("skins")
     
     async def get_skin_by_id(self, skin_id: int) -> Dict[str, Any]:
         """Retorna informações de uma skin específica"""
-        return await self._make_request(f"skins/{skin_id}")
+        return await self._get_by_id("skins", skin_id)
     
     async def get_minis(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna minis"""
         if ids:
-            return await self._make_request("minis", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("minis", ids)
         return await self._make_request("minis")
     
     async def get_mini_by_id(self, mini_id: int) -> Dict[str, Any]:
         """Retorna informações de um mini específico"""
-        return await self._make_request(f"minis/{mini_id}")
+        return await self._get_by_id("minis", mini_id)
     
     async def get_titles(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna títulos"""
         if ids:
-            return await self._make_request("titles", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("titles", ids)
         return await self._make_request("titles")
     
     async def get_title_by_id(self, title_id: int) -> Dict[str, Any]:
         """Retorna informações de um título específico"""
-        return await self._make_request(f"titles/{title_id}")
+        return await self._get_by_id("titles", title_id)
     
     async def get_dyes(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna corantes"""
         if ids:
-            return await self._make_request("colors", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("colors", ids)
         return await self._make_request("colors")
     
     async def get_dye_by_id(self, dye_id: int) -> Dict[str, Any]:
         """Retorna informações de um corante específico"""
-        return await self._make_request(f"colors/{dye_id}")
+        return await self._get_by_id("colors", dye_id)
     
     async def get_currencies(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna moedas"""
         if ids:
-            return await self._make_request("currencies", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("currencies", ids)
         return await self._make_request("currencies")
     
     async def get_currency_by_id(self, currency_id: int) -> Dict[str, Any]:
         """Retorna informações de uma moeda específica"""
-        return await self._make_request(f"currencies/{currency_id}")
+        return await self._get_by_id("currencies", currency_id)
     
     async def get_materials(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna materiais"""
         if ids:
-            return await self._make_request("materials", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("materials", ids)
         return await self._make_request("materials")
     
     async def get_material_by_id(self, material_id: int) -> Dict[str, Any]:
         """Retorna informações de um material específico"""
-        return await self._make_request(f"materials/{material_id}")
+        return await self._get_by_id("materials", material_id)
     
     async def get_recipes(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna receitas"""
         if ids:
-            return await self._make_request("recipes", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("recipes", ids)
         return await self._make_request("recipes")
     
     async def get_recipe_by_id(self, recipe_id: int) -> Dict[str, Any]:
         """Retorna informações de uma receita específica"""
-        return await self._make_request(f"recipes/{recipe_id}")
+        return await self._get_by_id("recipes", recipe_id)
     
     async def search_recipes(self, input_item_id: int) -> List[int]:
         """Busca receitas por item de entrada"""
@@ -260,22 +934,22 @@ class GW2APIService:
     async def get_dungeons(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna masmorras"""
         if ids:
-            return await self._make_request("dungeons", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("dungeons", ids)
         return await self._make_request("dungeons")
     
     async def get_dungeon_by_id(self, dungeon_id: int) -> Dict[str, Any]:
         """Retorna informações de uma masmorra específica"""
-        return await self._make_request(f"dungeons/{dungeon_id}")
+        return await self._get_by_id("dungeons", dungeon_id)
     
     async def get_raids(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna raids"""
         if ids:
-            return await self._make_request("raids", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("raids", ids)
         return await self._make_request("raids")
     
     async def get_raid_by_id(self, raid_id: int) -> Dict[str, Any]:
         """Retorna informações de uma raid específica"""
-        return await self._make_request(f"raids/{raid_id}")
+        return await self._get_by_id("raids", raid_id)
     
     async def get_guild_by_id(self, guild_id: str) -> Dict[str, Any]:
         """Retorna informações de uma guilda específica"""
@@ -288,7 +962,7 @@ class GW2APIService:
     async def get_guild_permissions(self, ids: Optional[List[str]] = None) -> Union[List[str], List[Dict[str, Any]]]:
         """Retorna permissões de guilda"""
         if ids:
-            return await self._make_request("guild/permissions", params={"ids": ",".join(ids)})
+            return await self._get_by_ids("guild/permissions", ids)
         return await self._make_request("guild/permissions")
     
     async def search_guilds(self, name: str) -> List[str]:
@@ -298,7 +972,7 @@ class GW2APIService:
     async def get_guild_upgrades(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna upgrades de guilda"""
         if ids:
-            return await self._make_request("guild/upgrades", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("guild/upgrades", ids)
         return await self._make_request("guild/upgrades")
     
     # Endpoints autenticados (requerem chave de API)
@@ -318,6 +992,10 @@ class GW2APIService:
         """Retorna lista de personagens da conta"""
         return await self._make_request("characters", api_key=api_key)
     
+    async def get_characters_details(self, api_key: str) -> List[Dict[str, Any]]:
+        """Retorna os dados completos de todos os personagens em uma única requisição (ids=all)"""
+        return await self._make_request("characters", params={"ids": "all"}, api_key=api_key)
+    
     async def get_character_info(self, character_name: str, api_key: str) -> Dict[str, Any]:
         """Retorna informações de um personagem específico"""
         return await self._make_request(f"characters/{character_name}", api_key=api_key)
@@ -350,6 +1028,52 @@ class GW2APIService:
         """Retorna informações sobre a chave de API"""
         return await self._make_request("tokeninfo", api_key=api_key)
     
+    async def get_account_snapshot(self, api_key: str) -> Dict[str, Any]:
+        """Retorna conta, personagens, carteira, banco, materiais e tokeninfo em um único documento.
+        
+        As seções são buscadas em paralelo; cada uma registra seu tempo em milissegundos e,
+        em caso de falha, a mensagem de erro. Se todas falharem, o primeiro erro é propagado.
+        """
+        sections = {
+            "account": self.get_account_info(api_key),
+            "characters": self.get_characters_details(api_key),
+            "wallet": self.get_account_wallet(api_key),
+            "bank": self.get_account_bank(api_key),
+            "materials": self.get_account_materials(api_key),
+            "tokeninfo": self.get_token_info(api_key),
+        }
+        
+        async def timed(name: str, request):
+            started = time.perf_counter()
+            try:
+                return name, await request, None, time.perf_counter() - started
+            except Exception as e:
+                return name, None, e, time.perf_counter() - started
+        
+        results = await asyncio.gather(*(timed(name, request) for name, request in sections.items()))
+        
+        snapshot: Dict[str, Any] = {"timings": {}, "errors": {}}
+        for name, data, error, elapsed in results:
+            snapshot[name] = data
+            snapshot["timings"][name] = round(elapsed * 1000, 2)
+            if error is not None:
+                # A mensagem do httpx inclui a URL com o access_token; expomos apenas o status
+                if isinstance(error, httpx.HTTPStatusError):
+                    message = f"Erro HTTP {error.response.status_code}"
+                else:
+                    message = str(error) or type(error).__name__
+                if isinstance(error, GW2NotFoundError):
+                    logger.info(f"Seção '{name}' do snapshot da conta não encontrada: {message}")
+                else:
+                    logger.error(f"Erro ao obter seção '{name}' do snapshot da conta: {message}")
+                snapshot["errors"][name] = message
+        
+        if len(snapshot["errors"]) == len(sections):
+            raise next(error for _, _, error, _ in results if error is not None)
+        snapshot["partial"] = bool(snapshot["errors"])
+        snapshot["generated_at"] = datetime.utcnow()
+        return snapshot
+    
     # WvW endpoints
     async def get_wvw_matches(self, world_id: Optional[int] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna partidas WvW"""
@@ -364,38 +1088,38 @@ class GW2APIService:
     async def get_wvw_objectives(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna objetivos WvW"""
         if ids:
-            return await self._make_request("wvw/objectives", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("wvw/objectives", ids)
         return await self._make_request("wvw/objectives")
     
     async def get_wvw_ranks(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna ranks WvW"""
         if ids:
-            return await self._make_request("wvw/ranks", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("wvw/ranks", ids)
         return await self._make_request("wvw/ranks")
     
     async def get_wvw_abilities(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna habilidades WvW"""
         if ids:
-            return await self._make_request("wvw/abilities", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("wvw/abilities", ids)
         return await self._make_request("wvw/abilities")
     
     async def get_wvw_upgrades(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna upgrades WvW"""
         if ids:
-            return await self._make_request("wvw/upgrades", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("wvw/upgrades", ids)
         return await self._make_request("wvw/upgrades")
     
     # Trading Post endpoints
     async def get_trading_post_listings(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna listagens do Trading Post"""
         if ids:
-            return await self._make_request("commerce/listings", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("commerce/listings", ids)
         return await self._make_request("commerce/listings")
     
     async def get_trading_post_prices(self, ids: Optional[List[int]] = None) -> Union[List[int], List[Dict[str, Any]]]:
         """Retorna preços do Trading Post"""
         if ids:
-            return await self._make_request("commerce/prices", params={"ids": ",".join(map(str, ids))})
+            return await self._get_by_ids("commerce/prices", ids)
         return await self._make_request("commerce/prices")
     
     async def get_exchange_coins_to_gems(self, coins: int) -> Dict[str, Any]:
@@ -0,0 +1,171 @@
+import asyncio
+import binascii
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.config import settings
+from services.gw2_build_watcher import build_watcher
+from services.gw2_service import GW2APIService, gw2_service
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PENDING = "pending"
+WARMUP_RUNNING = "warming"
+WARMUP_READY = "ready"
+
+
+class CacheWarmer:
+    """Pré-carrega no cache os dados estáticos mais acessados ao iniciar a aplicação.
+
+    Enquanto o aquecimento não termina, o readiness probe responde 503 para que o
+    balanceador só envie tráfego a instâncias com o cache quente. Falhas e o tempo
+    limite não impedem a instância de ficar pronta; elas apenas aparecem no progresso.
+    O cache em memória também é salvo em um snapshot no desligamento e recarregado
+    na inicialização.
+    """
+
+    def __init__(self, service: GW2APIService):
+        self.service = service
+        self.state = WARMUP_PENDING
+        self.targets: Dict[str, str] = {}
+        self.restored = 0
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == WARMUP_READY
+
+    def _warmup_targets(self) -> List[Tuple[str, Callable[[], Awaitable[Any]]]]:
+        targets: List[Tuple[str, Callable[[], Awaitable[Any]]]] = [
+            (endpoint, lambda endpoint=endpoint: self.service.get_payload(endpoint))
+            for endpoint in settings.gw2_warmup_endpoints_list
+        ]
+        item_ids = settings.gw2_warmup_item_ids_list
+        if item_ids:
+            targets.append(("items", lambda: self.service.get_items(item_ids)))
+        return targets
+
+    async def _warm(self, name: str, factory: Callable[[], Awaitable[Any]]):
+        try:
+            await factory()
+        except Exception as e:
+            self.targets[name] = "failed"
+            logger.warning(f"Erro ao pré-carregar {name} no cache: {str(e)}")
+        else:
+            self.targets[name] = "done"
+
+    async def run(self):
+        """Pré-carrega todos os alvos em paralelo, respeitando gw2_warmup_timeout"""
+        self.state = WARMUP_RUNNING
+        self._started_at = time.monotonic()
+        targets = self._warmup_targets()
+        self.targets = {name: WARMUP_PENDING for name, _ in targets}
+        try:
+            # A build atual define as chaves dos catálogos estáticos; ela vem antes do restante
+            if settings.gw2_build_watch_enabled and self.service.build_id is None:
+                try:
+                    await build_watcher.check()
+                except Exception as e:
+                    logger.warning(f"Erro ao consultar a build do GW2 no aquecimento: {str(e)}")
+            await asyncio.wait_for(
+                asyncio.gather(*(self._warm(name, factory) for name, factory in targets)),
+                timeout=settings.gw2_warmup_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Aquecimento do cache excedeu {settings.gw2_warmup_timeout}s; seguindo com o cache parcial")
+            for name, status in self.targets.items():
+                if status == WARMUP_PENDING:
+                    self.targets[name] = "timeout"
+        finally:
+            self.state = WARMUP_READY
+            self._finished_at = time.monotonic()
+        logger.info(f"Aquecimento do cache concluído em {self._finished_at - self._started_at:.2f}s: {self.targets}")
+
+    def start(self):
+        """Inicia o aquecimento em segundo plano (a aplicação já aceita conexões)"""
+        if not settings.gw2_warmup_enabled:
+            self.state = WARMUP_READY
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def progress(self) -> Dict[str, Any]:
+        completed = sum(1 for status in self.targets.values() if status != WARMUP_PENDING)
+        elapsed = None
+        if self._started_at is not None:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        return {
+            "state": self.state,
+            "completed": completed,
+            "total": len(self.targets),
+            "targets": self.targets,
+            "elapsed": elapsed,
+            "restored_from_snapshot": self.restored,
+        }
+
+    # Snapshot do cache em memória
+    def _read_snapshot(self, path: str) -> List[Dict[str, Any]]:
+        with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+            return json.load(snapshot)
+
+    def _write_snapshot(self, path: str, records: List[Dict[str, Any]]):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Cada worker grava em um arquivo temporário próprio e substitui o snapshot atomicamente
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(temporary, "wt", encoding="utf-8") as snapshot:
+            json.dump(records, snapshot)
+        os.replace(temporary, path)
+
+    async def load_snapshot(self) -> int:
+        """Restaura o cache em memória a partir do snapshot salvo no último desligamento"""
+        path = settings.gw2_cache_snapshot_path
+        if not settings.gw2_cache_snapshot_enabled or not os.path.exists(path):
+            return 0
+        try:
+            records = await asyncio.to_thread(self._read_snapshot, path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Erro ao ler o snapshot do cache do GW2: {str(e)}")
+            return 0
+        try:
+            self.restored = self.service.cache.restore(records)
+        except (KeyError, TypeError, ValueError, binascii.Error) as e:
+            # Snapshot truncado ou de um formato antigo: descarta o que foi restaurado e começa a frio
+            logger.error(f"Snapshot do cache do GW2 inválido, ignorado: {type(e).__name__}: {str(e)}")
+            self.service.cache.invalidate()
+            self.restored = 0
+            return 0
+        logger.info(f"{self.restored} entradas restauradas do snapshot do cache do GW2")
+        return self.restored
+
+    async def save_snapshot(self) -> int:
+        """Salva o cache em memória em disco para a próxima inicialização"""
+        if not settings.gw2_cache_snapshot_enabled:
+            return 0
+        records = self.service.cache.snapshot()
+        try:
+            await asyncio.to_thread(self._write_snapshot, settings.gw2_cache_snapshot_path, records)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar o snapshot do cache do GW2: {str(e)}")
+            return 0
+        logger.info(f"Snapshot do cache do GW2 salvo com {len(records)} entradas")
+        return len(records)
+
+
+# Instância global do aquecimento do cache
+cache_warmer = CacheWarmer(gw2_service)
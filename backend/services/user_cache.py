@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.config import settings
+from app.schemas import User
+
+
+class UserCache:
+    """Small in-process LRU cache of authenticated users, keyed by the token subject (email).
+
+    Entries are immutable schema snapshots, never ORM instances, so they can be shared
+    between requests. Each worker keeps its own cache; the short TTL bounds how long
+    another worker may serve a record after a change made elsewhere.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, email: str) -> Optional[User]:
+        entry = self._entries.get(email)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[email]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(email)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, email: str, user: User):
+        if self.ttl <= 0:
+            return
+        self._entries[email] = (user, time.monotonic() + self.ttl)
+        self._entries.move_to_end(email)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email: str):
+        if self._entries.pop(email, None) is not None:
+            self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def entries(self) -> Dict[str, Tuple[User, float]]:
+        """Copy of the cached entries (user, expiry) keyed by email."""
+        return dict(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global authenticated-user cache
+user_cache = UserCache(ttl=settings.auth_user_cache_ttl, max_entries=settings.auth_user_cache_max_entries)
@@ -1,36 +1,90 @@
-from sqlalchemy.orm import Session
+import base64
+import json
+from sqlalchemy import literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User
-from app.schemas import UserCreate, UserUpdate
-from app.utils.auth import get_password_hash, verify_password
-from typing import Optional
+from app.schemas import User as UserSchema, UserCreate, UserUpdate
+from app.utils.auth import get_password_hash_async
+from services.user_cache import user_cache
+from services.write_behind import write_behind
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+
+# Columns returned by the user listing (everything the User schema exposes, never the password hash)
+LIST_COLUMNS = [getattr(User, name) for name in UserSchema.model_fields]
+
+def encode_cursor(created_at: datetime, user_id: int) -> str:
+    """Build the opaque cursor pointing right after the given user."""
+    raw = json.dumps({"c": created_at.isoformat(), "i": user_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Parse a cursor produced by encode_cursor; raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["c"]), int(data["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
-        return self.db.query(User).filter(User.email == email).first()
+        return await self.db.scalar(select(User).where(User.email == email).limit(1))
     
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        return self.db.query(User).filter(User.id == user_id).first()
+        return await self.db.get(User, user_id)
     
-    def get_user_by_username(self, username: str) -> Optional[User]:
+    async def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
-        return self.db.query(User).filter(User.username == username).first()
+        return await self.db.scalar(select(User).where(User.username == username).limit(1))
     
-    def create_user(self, user_data: UserCreate) -> User:
+    async def list_users(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        is_active: Optional[bool] = None,
+        is_verified: Optional[bool] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """List users with keyset pagination on (created_at, id).
+        
+        Only the listed columns are selected and returned as plain mappings (no ORM
+        hydration), so each page costs O(limit) regardless of how deep it is.
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        query = select(*LIST_COLUMNS)
+        if is_active is not None:
+            query = query.where(User.is_active == is_active)
+        if is_verified is not None:
+            query = query.where(User.is_verified == is_verified)
+        if cursor:
+            created_at, user_id = decode_cursor(cursor)
+            # Bound with the column type: an untyped datetime is sent as timestamp without time zone
+            query = query.where(tuple_(User.created_at, User.id) > tuple_(literal(created_at, User.created_at.type), user_id))
+        query = query.order_by(User.created_at, User.id).limit(limit + 1)
+        
+        rows = [dict(row) for row in (await self.db.execute(query)).mappings()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return rows, next_cursor
+    
+    async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user."""
         # Check if user already exists
-        if self.get_user_by_email(user_data.email):
+        if await self.get_user_by_email(user_data.email):
             raise ValueError("Email already registered")
         
-        if user_data.username and self.get_user_by_username(user_data.username):
+        if user_data.username and await self.get_user_by_username(user_data.username):
             raise ValueError("Username already taken")
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         db_user = User(
             email=user_data.email,
             username=user_data.username,
@@ -39,19 +93,19 @@ class UserService:
         )
         
         self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
+        await self.db.commit()
+        await self.db.refresh(db_user)
         return db_user
     
-    def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
+    async def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
         """Update user information."""
-        user = self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id)
         if not user:
             return None
         
         # Update fields if provided
         if user_data.username is not None:
-            if user_data.username != user.username and self.get_user_by_username(user_data.username):
+            if user_data.username != user.username and await self.get_user_by_username(user_data.username):
                 raise ValueError("Username already taken")
             user.username = user_data.username
         
@@ -59,34 +113,33 @@ class UserService:
             user.full_name = user_data.full_name
         
         if user_data.password is not None:
-            user.hashed_password = get_password_hash(user_data.password)
+            user.hashed_password = await get_password_hash_async(user_data.password)
         
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        user_cache.invalidate(user.email)
         return user
     
-    def update_last_login(self, user_id: int):
-        """Update user's last login timestamp."""
-        user = self.get_user_by_id(user_id)
-        if user:
-            from datetime import datetime
-            user.last_login = datetime.utcnow()
-            self.db.commit()
+    async def update_last_login(self, user_id: int):
+        """Record user's last login timestamp; it is written in bulk by the write-behind buffer."""
+        write_behind.record(User.last_login, user_id, datetime.now(timezone.utc))
     
-    def deactivate_user(self, user_id: int) -> bool:
+    async def deactivate_user(self, user_id: int) -> bool:
         """Deactivate a user."""
-        user = self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id)
         if user:
             user.is_active = False
-            self.db.commit()
+            await self.db.commit()
+            user_cache.invalidate(user.email)
             return True
         return False
     
-    def activate_user(self, user_id: int) -> bool:
+    async def activate_user(self, user_id: int) -> bool:
         """Activate a user."""
-        user = self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id)
         if user:
             user.is_active = True
-            self.db.commit()
+            await self.db.commit()
+            user_cache.invalidate(user.email)
             return True
         return False
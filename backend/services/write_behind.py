@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Column, column, update, values
+from database.connection import AsyncSessionLocal
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rows per statement, keeping the bind parameters well below the asyncpg limit of 32767
+FLUSH_BATCH_SIZE = 5000
+
+
+class WriteBehindBuffer:
+    """Buffers low-priority column updates (e.g. last_login) in memory and writes them in bulk.
+
+    Updates are keyed by column and row id; only the latest value per row is kept. A
+    background task flushes every `interval` seconds (or sooner when `max_pending` rows
+    are waiting), issuing one `UPDATE ... FROM (VALUES ...)` statement per column. The
+    buffer is flushed on shutdown; rows that fail to flush are retried on the next run.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, interval: float = 5.0, max_pending: int = 10000):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[Column, Dict[Any, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        self.recorded = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failures = 0
+
+    @property
+    def pending(self) -> int:
+        return sum(len(rows) for rows in self._pending.values())
+
+    def record(self, attribute, row_id: Any, value: Any):
+        """Schedule `attribute = value` for the row with the given primary key."""
+        self._pending.setdefault(attribute.expression, {})[row_id] = value
+        self.recorded += 1
+        if self.pending >= self.max_pending:
+            self._wakeup.set()
+
+    def _statement(self, target: Column, rows: List[Tuple[Any, Any]]):
+        table = target.table
+        primary_key = table.primary_key.columns.values()[0]
+        data = values(
+            column("id", primary_key.type),
+            column("value", target.type),
+            name="pending",
+        ).data(rows)
+        return (
+            update(table)
+            .where(primary_key == data.c.id)
+            .values({target.name: data.c.value})
+        )
+
+    async def flush(self) -> int:
+        """Write all pending updates; returns the number of rows flushed."""
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            flushed = 0
+            for target, rows in pending.items():
+                try:
+                    items = list(rows.items())
+                    async with self.session_factory() as db:
+                        for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                            await db.execute(self._statement(target, items[start:start + FLUSH_BATCH_SIZE]))
+                        await db.commit()
+                except Exception as e:
+                    self.failures += 1
+                    logger.error(f"Failed to flush {len(rows)} pending updates to {target}: {str(e)}")
+                    # Keep newer values recorded while the flush was running
+                    retry = self._pending.setdefault(target, {})
+                    for row_id, value in rows.items():
+                        retry.setdefault(row_id, value)
+                    continue
+                flushed += len(rows)
+            self.flushed += flushed
+            self.flushes += 1
+            return flushed
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task and flush whatever is still buffered."""
+        if self._task is not None:
+            # Let an in-progress flush finish instead of cancelling it halfway
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "interval": self.interval,
+        }
+
+
+# Global write-behind buffer for bookkeeping updates
+write_behind = WriteBehindBuffer(
+    interval=settings.write_behind_flush_interval,
+    max_pending=settings.write_behind_max_pending,
+)
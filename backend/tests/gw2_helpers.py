@@ -0,0 +1,24 @@
+import httpx
+from app.middleware import _response_headers
+from services.gw2_cache import GW2Payload
+from services.gw2_service import GW2APIService
+
+
+def make_service(handler) -> GW2APIService:
+    service = GW2APIService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url=service.base_url)
+    return service
+
+
+async def with_headers(coroutine):
+    """Runs the call like a request handled by ResponseHeadersMiddleware and returns its headers"""
+    headers = {}
+    _response_headers.set(headers)
+    try:
+        return await coroutine, headers
+    except Exception as e:
+        return e, headers
+
+
+def cache_stale(service: GW2APIService, endpoint: str, entry):
+    service.cache.set(service._entity_key(endpoint, entry["id"]), GW2Payload.from_data(entry), ttl=0.01, size=1, namespace="static")
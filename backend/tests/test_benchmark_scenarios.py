@@ -0,0 +1,42 @@
+import asyncio
+import json
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import database.connection
+from benchmarks.scenarios import LoginStormScenario, ScenarioOptions
+from database.connection import Base
+from models.user import User
+
+
+def test_login_storm_teardown_deletes_only_the_users_it_created(monkeypatch):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        monkeypatch.setattr(database.connection, "AsyncSessionLocal", sessions)
+        async with sessions() as db:
+            # Left over by an interrupted run: kept, since this run didn't create it
+            db.add(User(email="benchmark-0@taimilab.com", username="benchmark-0", hashed_password="x"))
+            await db.commit()
+
+        async def create_user(request):
+            email = json.loads(request.content)["email"]
+            async with sessions() as db:
+                if await db.scalar(select(User).where(User.email == email)):
+                    return httpx.Response(400, json={"detail": "Email already registered"})
+                db.add(User(email=email, username=email.split("@")[0], hashed_password="x"))
+                await db.commit()
+            return httpx.Response(200, json={})
+
+        scenario = LoginStormScenario(ScenarioOptions(login_users=3))
+        async with httpx.AsyncClient(transport=httpx.MockTransport(create_user), base_url="http://app") as client:
+            await scenario.setup(client)
+            await scenario.teardown(client)
+        async with sessions() as db:
+            emails = list(await db.scalars(select(User.email)))
+        await engine.dispose()
+        return emails
+
+    assert asyncio.run(run()) == ["benchmark-0@taimilab.com"]
@@ -0,0 +1,63 @@
+import asyncio
+import httpx
+from app.config import settings
+from tests.gw2_helpers import cache_stale, make_service, with_headers
+
+
+def test_single_id_served_stale_sets_stale_headers():
+    def handler(request):
+        return httpx.Response(503, json={"text": "API not active"})
+
+    async def run():
+        service = make_service(handler)
+        cache_stale(service, "items", {"id": 1, "name": "old"})
+        await asyncio.sleep(0.02)
+        return await asyncio.create_task(with_headers(service._get_by_id("items", 1)))
+
+    entry, headers = asyncio.run(run())
+    assert entry == {"id": 1, "name": "old"}
+    assert headers["X-GW2-Stale"] == "true"
+    assert "Warning" in headers
+
+
+def test_failed_id_in_partial_batch_sets_failed_count_only_for_its_caller(monkeypatch):
+    monkeypatch.setattr(settings, "gw2_batch_chunk_size", 1)
+
+    def handler(request):
+        ids = request.url.params["ids"]
+        if ids == "2":
+            return httpx.Response(503, json={"text": "API not active"})
+        return httpx.Response(200, json=[{"id": int(ids), "name": f"item {ids}"}])
+
+    async def run():
+        service = make_service(handler)
+        return await asyncio.gather(
+            asyncio.create_task(with_headers(service._get_by_id("items", 1))),
+            asyncio.create_task(with_headers(service._get_by_id("items", 2))),
+        )
+
+    (entry, ok_headers), (error, failed_headers) = asyncio.run(run())
+    assert entry == {"id": 1, "name": "item 1"}
+    assert "X-GW2-Failed-Ids-Count" not in ok_headers
+    assert isinstance(error, httpx.HTTPStatusError)
+    assert failed_headers["X-GW2-Failed-Ids-Count"] == "1"
+
+
+def test_raw_by_ids_joins_cached_bodies_and_reports_failed_ids(monkeypatch):
+    monkeypatch.setattr(settings, "gw2_batch_chunk_size", 1)
+
+    def handler(request):
+        ids = request.url.params["ids"]
+        if ids == "3":
+            return httpx.Response(503, json={"text": "API not active"})
+        return httpx.Response(200, json=[{"id": int(ids), "name": f"item {ids}"}])
+
+    async def run():
+        service = make_service(handler)
+        body, headers = await with_headers(service.get_raw_by_ids("items", [2, 1, 3]))
+        return service, body, headers
+
+    service, body, headers = asyncio.run(run())
+    assert body == b'[{"id":2,"name":"item 2"},{"id":1,"name":"item 1"}]'
+    assert body.startswith(service.cache.get_stale(service._entity_key("items", 2)).body, 1)
+    assert headers["X-GW2-Failed-Ids-Count"] == "1"
@@ -0,0 +1,92 @@
+import asyncio
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.connection import Base
+from models.gw2_models import GW2CatalogEntry
+from services.gw2_cache import MISS, GW2Payload
+from services.gw2_catalog_sync import GW2CatalogMirror
+from tests.gw2_helpers import make_service
+
+CATALOG = {1: {"id": 1, "name": "old"}, 2: {"id": 2, "name": "old"}}
+
+
+def handler(request):
+    path = request.url.path.rsplit("/", 1)[-1]
+    if path != "items":
+        return httpx.Response(404, json={"text": "no such endpoint"})
+    if "page" in request.url.params:
+        return httpx.Response(200, json=list(CATALOG.values()))
+    if "ids" in request.url.params:
+        ids = [int(id) for id in request.url.params["ids"].split(",")]
+        return httpx.Response(200, json=[CATALOG[id] for id in ids if id in CATALOG])
+    return httpx.Response(200, json=sorted(CATALOG))
+
+
+def make_mirror(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'mirror.sqlite3'}")
+    Base.metadata.create_all(engine, tables=[GW2CatalogEntry.__table__])
+    sessions = sessionmaker(bind=engine)
+    service = make_service(handler)
+    mirror = GW2CatalogMirror(service, session_factory=sessions, engine=engine)
+
+    # O upsert usa ON CONFLICT do Postgres; no SQLite o merge do ORM tem o mesmo efeito
+    def upsert(resource, entries):
+        with sessions() as db:
+            for entry, digest in entries:
+                db.merge(GW2CatalogEntry(
+                    resource=resource, entry_id=entry["id"], data=entry,
+                    content_hash=digest, build_id=service.build_id,
+                ))
+            db.commit()
+
+    mirror._upsert = upsert
+    service.catalog_mirror = mirror
+    return service, mirror
+
+
+def test_mirror_is_skipped_until_synced_with_the_new_build(tmp_path):
+    async def run():
+        service, mirror = make_mirror(tmp_path)
+        service.build_id = 100
+        first = await mirror.sync("items")
+        assert first["full"] and mirror.is_current("items")
+
+        # Nova build: o espelho (build 100) não pode servir nem alimentar o cache da build 101
+        service.build_id = 101
+        assert not mirror.is_current("items")
+        CATALOG[1] = {"id": 1, "name": "new"}
+        mirrored = []
+        get_many = mirror.get_many
+        mirror.get_many = lambda resource, ids: mirrored.append(ids) or get_many(resource, ids)
+        entries = await service._get_by_ids("items", [1])
+        assert mirrored == [] and list(entries) == [{"id": 1, "name": "new"}]
+
+        # Entrada gravada com a chave da nova build a partir do espelho antigo (corrida com a troca de build)
+        key = service._entity_key("items", 2)
+        service.cache.set(key, GW2Payload.from_data({"id": 2, "name": "stale"}), ttl=60, size=1, namespace="static")
+
+        second = await mirror.sync("items")
+        assert second["full"] and second["written"] == 1
+        assert mirror.is_current("items") and mirror.builds["items"] == 101
+        assert service.cache.get(key) is MISS and service.cache.get_stale(key) is MISS
+
+        await mirror.load_state()
+        assert mirror.builds == {"items": 101}
+
+    try:
+        asyncio.run(run())
+    finally:
+        CATALOG[1] = {"id": 1, "name": "old"}
+
+
+def test_sync_is_skipped_while_another_worker_holds_the_lock(tmp_path):
+    async def run():
+        service, mirror = make_mirror(tmp_path)
+        service.build_id = 100
+        mirror._acquire_sync_lock = lambda resource: None
+        return await mirror.sync("items"), mirror
+
+    result, mirror = asyncio.run(run())
+    assert result == {"resource": "items", "skipped": True}
+    assert not mirror.is_current("items")
@@ -0,0 +1,49 @@
+import asyncio
+import time
+import httpx
+from app.config import settings
+from tests.gw2_helpers import cache_stale, make_service, with_headers
+
+UPSTREAM_DELAY = 1.0
+
+
+async def slow_handler(request):
+    await asyncio.sleep(UPSTREAM_DELAY)
+    ids = request.url.params.get("ids", "")
+    return httpx.Response(200, json=[{"id": int(id), "name": "new"} for id in ids.split(",") if id])
+
+
+def run_with_stale(monkeypatch, call):
+    monkeypatch.setattr(settings, "gw2_stale_timeout", 0.1)
+
+    async def run():
+        service = make_service(slow_handler)
+        for id in (1, 2):
+            cache_stale(service, "items", {"id": id, "name": "old"})
+        await asyncio.sleep(0.02)
+        started = time.monotonic()
+        result, headers = await asyncio.create_task(with_headers(call(service)))
+        return result, headers, time.monotonic() - started
+
+    return asyncio.run(run())
+
+
+def test_single_id_serves_stale_when_upstream_is_slow(monkeypatch):
+    entry, headers, elapsed = run_with_stale(monkeypatch, lambda service: service._get_by_id("items", 1))
+    assert entry == {"id": 1, "name": "old"}
+    assert headers["X-GW2-Stale"] == "true"
+    assert elapsed < UPSTREAM_DELAY / 2
+
+
+def test_bulk_ids_serve_stale_when_upstream_is_slow(monkeypatch):
+    entries, headers, elapsed = run_with_stale(monkeypatch, lambda service: service._get_by_ids("items", [1, 2]))
+    assert list(entries) == [{"id": 1, "name": "old"}, {"id": 2, "name": "old"}]
+    assert entries.stale_ids == [1, 2] and not entries.failed_ids
+    assert headers["X-GW2-Stale"] == "true"
+    assert elapsed < UPSTREAM_DELAY / 2
+
+
+def test_bulk_ids_without_stale_copy_wait_for_upstream(monkeypatch):
+    entries, headers, elapsed = run_with_stale(monkeypatch, lambda service: service._get_by_ids("items", [1, 3]))
+    assert list(entries) == [{"id": 1, "name": "new"}, {"id": 3, "name": "new"}]
+    assert "X-GW2-Stale" not in headers
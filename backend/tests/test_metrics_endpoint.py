@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from routers import metrics
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+
+def test_metrics_require_the_configured_token(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    client = make_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "gw2_cache_hits_total" in response.text
+
+
+def test_metrics_without_token_are_hidden_outside_development(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "")
+    monkeypatch.setattr(settings, "environment", "production")
+    assert make_client().get("/metrics").status_code == 404
+    monkeypatch.setattr(settings, "environment", "development")
+    assert make_client().get("/metrics").status_code == 200
+
+
+def test_multiprocess_scrape_aggregates_worker_files(monkeypatch, tmp_path):
+    # Two short-lived "workers" record an upstream call each into the shared directory
+    worker = "from app.metrics import observe_upstream; observe_upstream('items', 200, 0.1)"
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, cwd=BACKEND_DIR, check=True)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "metrics_token", "")
+    monkeypatch.setattr(settings, "environment", "development")
+    response = make_client().get("/metrics")
+    assert response.status_code == 200
+    assert 'gw2_upstream_request_duration_seconds_count{endpoint="items",status="200"} 2.0' in response.text
+    assert "gw2_cache_hits_total" in response.text
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.utils import auth
+from database.connection import Base
+from models.user import User
+
+
+def test_cancelled_job_that_never_started_leaves_the_queue(monkeypatch):
+    monkeypatch.setattr(auth, "_password_executor", ThreadPoolExecutor(max_workers=1))
+    release = threading.Event()
+
+    async def run():
+        queued = auth._password_stats["queued"]
+        busy = asyncio.ensure_future(auth._run_password_task(release.wait))
+        waiting = asyncio.ensure_future(auth._run_password_task(lambda: "ran"))
+        await asyncio.sleep(0.05)
+        assert auth._password_stats["queued"] == queued + 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        release.set()
+        await busy
+        await asyncio.sleep(0.05)
+        return queued
+
+    queued = asyncio.run(run())
+    assert auth._password_stats["queued"] == queued
+
+
+def test_failed_rehash_still_authenticates(monkeypatch):
+    monkeypatch.setattr(auth.settings, "bcrypt_rounds", 4)
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        old_hash = bcrypt.hashpw(b"Secret123", bcrypt.gensalt(rounds=5)).decode()
+        async with sessions() as db:
+            db.add(User(email="user@taimilab.com", username="user", hashed_password=old_hash))
+            await db.commit()
+
+        async with sessions() as db:
+            async def failing_commit():
+                raise OperationalError("UPDATE users", {}, Exception("database is locked"))
+
+            monkeypatch.setattr(db, "commit", failing_commit)
+            user = await auth.authenticate_user(db, "user@taimilab.com", "Secret123")
+            stored_hash = user and user.hashed_password
+        await engine.dispose()
+        return user, stored_hash, old_hash
+
+    user, stored_hash, old_hash = asyncio.run(run())
+    assert user and user.email == "user@taimilab.com"
+    assert stored_hash == old_hash
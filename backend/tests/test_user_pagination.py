@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import DateTime
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from database.connection import Base
+from models.user import User
+from services.user_service import UserService
+
+CREATED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+async def _paginate(limit: int):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with sessions() as db:
+        # Two users share a created_at so the id tie-breaker is exercised across the page boundary
+        db.add_all([
+            User(
+                email=f"user-{index}@taimilab.com",
+                username=f"user-{index}",
+                hashed_password="x",
+                created_at=CREATED_AT + timedelta(seconds=min(index, 2)),
+            )
+            for index in range(5)
+        ])
+        await db.commit()
+
+        statements = []
+        execute = db.execute
+
+        async def recording_execute(statement, *args, **kwargs):
+            statements.append(statement)
+            return await execute(statement, *args, **kwargs)
+
+        db.execute = recording_execute
+        service = UserService(db)
+        first, cursor = await service.list_users(limit=limit)
+        second, last_cursor = await service.list_users(limit=limit, cursor=cursor)
+    await engine.dispose()
+    return first, cursor, second, last_cursor, statements[-1]
+
+
+def test_second_page_follows_next_cursor():
+    first, cursor, second, last_cursor, _ = asyncio.run(_paginate(limit=3))
+
+    assert [user["email"] for user in first] == [f"user-{index}@taimilab.com" for index in range(3)]
+    assert cursor is not None
+    assert [user["email"] for user in second] == ["user-3@taimilab.com", "user-4@taimilab.com"]
+    assert last_cursor is None
+    assert "hashed_password" not in first[0]
+
+
+def test_cursor_is_bound_as_timestamp_with_time_zone():
+    *_, statement = asyncio.run(_paginate(limit=3))
+
+    # asyncpg rejects aware datetimes bound as timestamp without time zone
+    compiled = statement.compile(dialect=asyncpg.dialect())
+    datetime_binds = [bind for bind in compiled.binds.values() if isinstance(bind.value, datetime)]
+    assert datetime_binds
+    assert all(isinstance(bind.type, DateTime) and bind.type.timezone for bind in datetime_binds)
@@ -50,19 +50,13 @@ export const GW2Provider: React.FC<GW2ProviderProps> = ({ children }) => {
     setError(null);
 
     try {
-      // Carrega informações da conta
-      const accountData = await gw2Service.getAccount(apiKey);
-      setAccount(accountData);
-
-      // Carrega lista de personagens
-      const characterNames = await gw2Service.getCharacters(apiKey);
-      
-      // Carrega informações detalhadas de cada personagem
-      const characterPromises = characterNames.map((name: string) => 
-        gw2Service.getCharacter(name, apiKey)
-      );
-      const characterData = await Promise.all(characterPromises);
-      setCharacters(characterData);
+      // Carrega conta e personagens em uma única requisição
+      const snapshot = await gw2Service.getAccountSnapshot(apiKey);
+      if (!snapshot.account) {
+        throw new Error(snapshot.errors.account || 'Erro ao carregar dados da conta');
+      }
+      setAccount(snapshot.account);
+      setCharacters(snapshot.characters ?? []);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao carregar dados da conta');
       setAccount(null);
@@ -25,24 +25,16 @@ export const GW2Dashboard: React.FC = () => {
     setError(null);
 
     try {
-      // Recarrega os dados da conta
-      const accountData = await import('../../services/gw2.service').then(module => 
-        module.gw2Service.getAccount(apiKey)
+      // Recarrega os dados da conta em uma única requisição
+      const snapshot = await import('../../services/gw2.service').then(module => 
+        module.gw2Service.getAccountSnapshot(apiKey)
       );
       
-      const characterNames = await import('../../services/gw2.service').then(module => 
-        module.gw2Service.getCharacters(apiKey)
-      );
-      
-      const characterPromises = characterNames.map((name: string) => 
-        import('../../services/gw2.service').then(module => 
-          module.gw2Service.getCharacter(name, apiKey)
-        )
-      );
-      const characterData = await Promise.all(characterPromises);
-      
       // Atualiza o contexto (isso seria feito pelo contexto, mas para demonstração)
-      console.log('Dados atualizados:', { accountData, characterData });
+      console.log('Dados atualizados:', {
+        accountData: snapshot.account,
+        characterData: snapshot.characters
+      });
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Erro ao atualizar dados');
     } finally {
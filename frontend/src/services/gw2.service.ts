@@ -39,6 +39,7 @@ import type {
   GW2ExchangeRate,
   GW2TradingPostTransaction,
   GW2TradingPostDelivery,
+  GW2AccountSnapshot,
   GW2Service
 } from '../types/gw2';
 
@@ -314,6 +315,10 @@ class GW2APIService implements GW2Service {
     return this.handleRequest(() => this.api.get('/account', { params: { api_key: apiKey } }));
   }
 
+  async getAccountSnapshot(apiKey: string): Promise<GW2AccountSnapshot> {
+    return this.handleRequest(() => this.api.get('/account/snapshot', { params: { api_key: apiKey } }));
+  }
+
   async getAccountAchievements(apiKey: string): Promise<GW2AchievementProgress[]> {
     return this.handleRequest(() => this.api.get('/account/achievements', { params: { api_key: apiKey } }));
   }
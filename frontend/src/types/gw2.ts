@@ -1111,10 +1111,24 @@ export interface UseGW2TradingPostDeliveryReturn {
 }
 
 // Tipos para serviços
+export interface GW2AccountSnapshot {
+  account: GW2Account | null;
+  characters: GW2Character[] | null;
+  wallet: unknown[] | null;
+  bank: unknown[] | null;
+  materials: unknown[] | null;
+  tokeninfo: unknown | null;
+  timings: Record<string, number>;
+  errors: Record<string, string>;
+  partial: boolean;
+  generated_at: string;
+}
+
 export interface GW2Service {
   getAccount: (apiKey: string) => Promise<GW2Account>;
   getCharacters: (apiKey: string) => Promise<string[]>;
   getCharacter: (characterName: string, apiKey: string) => Promise<GW2Character>;
+  getAccountSnapshot: (apiKey: string) => Promise<GW2AccountSnapshot>;
   getAchievements: (ids?: number[]) => Promise<GW2Achievement[]>;
   getAchievement: (id: number) => Promise<GW2Achievement>;
   getItems: (ids?: number[]) => Promise<GW2Item[]>;